@@ -0,0 +1,90 @@
+"""Write the Executive Summary and Plans that Need Action KPIs for every account.
+
+Usage: python batch_report.py [--output-dir reports] [--workers N] [--start-date YYYY-MM-DD] [--end-date YYYY-MM-DD]
+
+The fact table is split by AccountID once and each account is computed in a
+worker process, producing <output-dir>/account_<AccountID>.json with the
+plan summary, UDA breakdown, per-provider UDAs and the action tables.
+"""
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from fact_table import load_fact_table
+from kpis import compute_claims_summary, compute_plan_summary, compute_provider_uda_metrics, compute_uda_breakdown
+
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+
+
+def _plain(value):
+    # numpy scalars to Python numbers and NaN to null, so the files are strict JSON
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, pd.DataFrame):
+        return json.loads(value.to_json(orient="split", date_format="iso"))
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def account_report(account_id, frame, filters, output_dir):
+    """Compute one account's KPIs (the same as selecting it in the sidebar) and write its file."""
+    report = {
+        "account_id": account_id,
+        "filters": filters,
+        "plan_summary": compute_plan_summary(frame, filters),
+        "uda_breakdown": compute_uda_breakdown(frame, filters),
+        "provider_udas": compute_provider_uda_metrics(frame, filters),
+    }
+    # The dashboard builds the action tables from the 2dp-rounded rows
+    claims = compute_claims_summary(frame.round(2), filters)
+    report["claims_summary"] = claims["summary"]
+    report["uda_pivot"] = claims["uda_pivot"]
+
+    path = os.path.join(output_dir, f"account_{account_id}.json")
+    with open(path, "w") as f:
+        json.dump(_plain(report), f, indent=2)
+    return account_id, path, len(frame)
+
+
+def run(output_dir=DEFAULT_OUTPUT_DIR, workers=None, start_date=None, end_date=None):
+    fact = load_fact_table()
+    filters = {"start_date": start_date, "end_date": end_date}
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(account_report, account_id, partition, filters, output_dir)
+            for account_id, partition in fact.groupby("AccountID", observed=True, sort=True)
+        ]
+        for future in as_completed(futures):
+            results.append(future.result())
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--start-date", help="only plans first completed on or after this date")
+    parser.add_argument("--end-date", help="only plans last completed on or before this date")
+    args = parser.parse_args()
+
+    results, seconds = run(args.output_dir, args.workers, args.start_date, args.end_date)
+    for account_id, path, rows in sorted(results, key=lambda result: str(result[0])):
+        print(f"{account_id}: {rows:,} rows -> {path}")
+    print(f"{len(results):,} accounts in {seconds:.2f}s ({len(results) / seconds:.1f} accounts/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Compare classify_plans() against the original row-wise apply() helpers.
+
+Usage: python benchmarks/bench_classification.py [scale]
+
+The bundled extracts are replicated `scale` times (default 100) to get a
+realistic group-sized frame, both paths are timed, and the results are
+checked for equality.
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classification import band_to_udas, classify_plans  # noqa: E402
+from data_loader import load_data  # noqa: E402
+
+FLAG_COLUMNS = ["isMixed", "isPNHS", "isFullPrivate", "inProgress", "Complete", "PendingFee", "isNHS",
+                "isClaimFailed", "isClaimQueued", "plansThatRequireAction", "UDAs", "whatAction"]
+
+
+def build_merged(scale):
+    treatment_plans, claims, nhs_plans = load_data()
+    treatment_plans['PlanProvider'] = treatment_plans['TreatmentProviders'].apply(lambda x: x.split(";")[0])
+    claims.rename(columns={'TreatmentPlanId': 'TreatmentPlanID'}, inplace=True)
+    merged = pd.merge(treatment_plans, nhs_plans, on='TreatmentPlanID', how='left')
+    merged = pd.merge(merged, claims, on='TreatmentPlanID', how='left')
+    return pd.concat([merged] * scale, ignore_index=True)
+
+
+# The original per-row implementation from app.py, kept as the reference
+def legacy_classify(df):
+    def checkMixed(PlanProvider, TotalNHSCodes, TotalTreatments):
+        if PlanProvider == "":
+            return ""
+        elif TotalNHSCodes > 0:
+            return 1 if TotalNHSCodes < TotalTreatments else 0
+        else:
+            return 0
+
+    def checkPrivateNHS(PlanProvider, TotalNHSCodes, TotalTreatments):
+        if PlanProvider == "":
+            return ""
+        elif TotalNHSCodes > 0:
+            return 1 if TotalNHSCodes == TotalTreatments else 0
+        else:
+            return 0
+
+    def checkFullPrivateNHS(PlanProvider, TotalNHSCodes, TotalTreatments):
+        if PlanProvider == "":
+            return ""
+        elif pd.isna(TotalNHSCodes):
+            return 1
+        else:
+            return 0
+
+    def calculateInProgress(PlanProvider, CompletedTreatments, TotalTreatments):
+        if PlanProvider == "":
+            return ""
+        if CompletedTreatments == 0:
+            return 0
+        return 1 if CompletedTreatments < TotalTreatments else 0
+
+    def calculateCompleted(PlanProvider, CompletedTreatments, TotalTreatments):
+        if PlanProvider == "":
+            return ""
+        if CompletedTreatments == 0:
+            return 0
+        return 1 if CompletedTreatments == TotalTreatments else 0
+
+    def calculatePendingFee(PlanProvider, TotalFee, CompletedTreatmentFee):
+        if PlanProvider == "":
+            return ""
+        return TotalFee - CompletedTreatmentFee
+
+    def checkIsNHS(isMixed, isPNHS):
+        if isPNHS == "":
+            return ""
+        return isMixed + isPNHS
+
+    def checkClaimFailed(ClaimStatus):
+        if pd.isna(ClaimStatus):
+            return ""
+        return 1 if ClaimStatus in ["Invalid", "Failed"] else 0
+
+    def checkClaimQueued(ClaimStatus):
+        if pd.isna(ClaimStatus):
+            return ""
+        return 1 if ClaimStatus in ["Submitted", "Queued"] else 0
+
+    def plansThatRequireAction(PlanProvider, isClaimFailed, isNHS, complete, ClaimStatus):
+        if pd.isna(PlanProvider):
+            return ""
+        if isClaimFailed == 1:
+            return 1
+        if isNHS == 1:
+            if complete == 1:
+                return 1 if pd.isna(ClaimStatus) else 0
+            return 0
+        return 0
+
+    def calculateAction(PlansThatRequireAction, isClaimFailed):
+        if pd.isna(PlansThatRequireAction):
+            return ""
+        if PlansThatRequireAction == 0:
+            return "No Action"
+        if isClaimFailed == 1:
+            return "Claim Invalid or Failed"
+        return "Claim Not Raised"
+
+    df['TotalNHSCodes'] = df['TotalNHSCodes'].astype(float)
+    df['TotalTreatments'] = df['TotalTreatments'].astype(float)
+    df['isMixed'] = df.apply(
+        lambda row: checkMixed(row['PlanProvider'], row['TotalNHSCodes'], row['TotalTreatments']), axis=1)
+    df['isPNHS'] = df.apply(
+        lambda row: checkPrivateNHS(row['PlanProvider'], row['TotalNHSCodes'], row['TotalTreatments']), axis=1)
+    df['isFullPrivate'] = df.apply(
+        lambda row: checkFullPrivateNHS(row['PlanProvider'], row['TotalNHSCodes'], row['TotalTreatments']), axis=1)
+    df['inProgress'] = df.apply(
+        lambda row: calculateInProgress(row['PlanProvider'], row['CompletedTreatments'], row['TotalTreatments']),
+        axis=1)
+    df['Complete'] = df.apply(
+        lambda row: calculateCompleted(row['PlanProvider'], row['CompletedTreatments'], row['TotalTreatments']),
+        axis=1)
+    df['PendingFee'] = df.apply(
+        lambda row: calculatePendingFee(row['PlanProvider'], row['TotalFee'], row['CompletedTreatmentsFee']), axis=1)
+    df['isNHS'] = df.apply(lambda row: checkIsNHS(row['isMixed'], row['isPNHS']), axis=1)
+    df['isClaimFailed'] = df['ClaimStatus'].apply(checkClaimFailed)
+    df['isClaimQueued'] = df['ClaimStatus'].apply(checkClaimQueued)
+    df['plansThatRequireAction'] = df.apply(
+        lambda row: plansThatRequireAction(row['PlanProvider'], row['isClaimFailed'], row['isNHS'], row['Complete'],
+                                           row['ClaimStatus']), axis=1)
+    df['UDAs'] = df['Band_x'].map(band_to_udas)
+    df['whatAction'] = df.apply(
+        lambda row: calculateAction(row['plansThatRequireAction'], row['isClaimFailed']), axis=1)
+    return df
+
+
+def normalise(series):
+    # "" in the legacy output corresponds to <NA> in the vectorized one
+    return [None if (isinstance(value, str) and value == "") or pd.isna(value) else value
+            for value in series.astype(object)]
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    merged = build_merged(scale)
+    print(f"rows: {len(merged):,}")
+
+    legacy = merged.copy()
+    start = time.perf_counter()
+    legacy = legacy_classify(legacy)
+    legacy_seconds = time.perf_counter() - start
+
+    vectorized = merged.copy()
+    start = time.perf_counter()
+    vectorized = classify_plans(vectorized)
+    vectorized_seconds = time.perf_counter() - start
+
+    mismatches = [col for col in FLAG_COLUMNS if normalise(legacy[col]) != normalise(vectorized[col])]
+
+    print(f"row-wise apply: {legacy_seconds:.3f}s")
+    print(f"vectorized:     {vectorized_seconds:.3f}s")
+    print(f"speed-up:       {legacy_seconds / vectorized_seconds:.0f}x")
+    print("results identical" if not mismatches else f"MISMATCH in {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Time each stage of the dashboard pipeline on synthetic extracts and keep a JSON history.
+
+Usage: python benchmarks/bench_pipeline.py [--plans 10000 100000 ...] [--accounts N] [--providers N]
+
+For each size, synthetic CSVs are generated once (benchmarks/.data/, reused on later
+runs) and the load (from CSV, then from the Parquet cache), merge, classification, KPI
+aggregation, pivot and pagination stages are timed separately. Every run is appended to benchmarks/results/history.json
+and compared with the previous run of the same size, so regressions stand out.
+"""
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from classification import classify_plans  # noqa: E402
+from columnar_cache import columnar_path  # noqa: E402
+from data_loader import SOURCE_FILES, frame_cache, load_data, source_path  # noqa: E402
+from fact_table import FACT_COLUMNS, drop_placeholder_dates, merge_extracts  # noqa: E402
+from ingest import ingest  # noqa: E402
+from kpi_cube import build_cube, plan_summary_counts, uda_breakdown_counts  # noqa: E402
+from kpis import compute_claims_summary  # noqa: E402
+from pagination import format_page, page_count, page_window, sort_order  # noqa: E402
+from provider_metrics import PLAN_PROVIDERS, provider_plan_counts, provider_uda_metrics  # noqa: E402
+from schema import compact  # noqa: E402
+from synthetic import generate  # noqa: E402
+
+DATA_CACHE_DIR = os.path.join(BENCH_DIR, ".data")
+HISTORY_PATH = os.path.join(BENCH_DIR, "results", "history.json")
+
+PAGE_SIZE = 100
+
+
+def dataset_dir(plans, accounts, providers, seed):
+    directory = os.path.join(DATA_CACHE_DIR, f"plans{plans}_accounts{accounts}_providers{providers}_seed{seed}")
+    if not all(os.path.exists(os.path.join(directory, filename)) for filename in SOURCE_FILES.values()):
+        generate(directory, plans, accounts, providers, seed)
+    return directory
+
+
+def load_extracts(directory):
+    """The three extracts with only the fact table's columns, read by load_data() as the dashboard does."""
+    # A cold read each time: parsed frames would otherwise be served from the process cache
+    frame_cache.clear()
+    return load_data(FACT_COLUMNS, directory)
+
+
+def write_parquet_cache(directory):
+    """The typed Parquet cache ingest.py writes, for the synthetic extracts."""
+    ingest(data_dir=directory)
+
+
+def run_stages(directory):
+    timings = {}
+
+    def timed(stage, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        timings[stage] = time.perf_counter() - start
+        return result
+
+    # CSV parse (chunked, explicit dtypes) and the Parquet fast path the dashboard normally takes
+    for path in [columnar_path(source_path(name, directory)) for name in SOURCE_FILES]:
+        if os.path.exists(path):
+            os.remove(path)
+    timed("load_csv", load_extracts, directory)
+    write_parquet_cache(directory)
+    treatment_plans, claims, nhs_plans = timed("load_parquet", load_extracts, directory)
+    merged = timed("merge", merge_extracts, treatment_plans, claims, nhs_plans)
+    fact = timed("classification", lambda: compact(drop_placeholder_dates(classify_plans(merged))))
+
+    def kpis():
+        cube = build_cube(fact)
+        return (plan_summary_counts(cube), uda_breakdown_counts(cube),
+                provider_uda_metrics(fact, PLAN_PROVIDERS), provider_plan_counts(fact, PLAN_PROVIDERS))
+
+    timed("kpi_aggregation", kpis)
+    claims_data = timed("pivot", compute_claims_summary, fact.round(2))["claims_data"]
+
+    def paginate():
+        # First and last page of the action list sorted by UDAs, as a user paging through it would
+        order = sort_order(claims_data, "UDAs", ascending=False)
+        for page in (1, page_count(len(claims_data), PAGE_SIZE)):
+            format_page(page_window(claims_data, page, PAGE_SIZE, order))
+
+    timed("pagination", paginate)
+    rows = {name: len(frame) for name, frame in
+            [("treatment_plans", treatment_plans), ("claims", claims), ("nhs_plans", nhs_plans), ("fact", fact)]}
+    return rows, timings
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=BENCH_DIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history():
+    if not os.path.exists(HISTORY_PATH):
+        return []
+    with open(HISTORY_PATH) as f:
+        return json.load(f)
+
+
+def save_history(history):
+    os.makedirs(os.path.dirname(HISTORY_PATH), exist_ok=True)
+    with open(HISTORY_PATH, "w") as f:
+        json.dump(history, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plans", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--providers", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    history = load_history()
+    commit = git_commit()
+    for plans in args.plans:
+        directory = dataset_dir(plans, args.accounts, args.providers, args.seed)
+        rows, timings = run_stages(directory)
+        config = {"plans": plans, "accounts": args.accounts, "providers": args.providers, "seed": args.seed}
+        previous = next((run for run in reversed(history) if run["config"] == config), None)
+
+        print(f"{plans:,} plans ({rows['fact']:,} fact rows)")
+        for stage, seconds in timings.items():
+            line = f"  {stage:<16} {seconds:8.3f}s"
+            if previous and previous["timings"].get(stage):
+                line += f"  {(seconds / previous['timings'][stage] - 1) * 100:+6.1f}% vs {previous['commit']}"
+            print(line)
+
+        history.append({
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": commit,
+            "config": config,
+            "rows": rows,
+            "timings": timings,
+        })
+    save_history(history)
+
+
+if __name__ == "__main__":
+    main()
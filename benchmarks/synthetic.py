@@ -0,0 +1,123 @@
+"""Generate synthetic TreatmentPlans/NHS Plans/Claims CSVs shaped like the bundled extracts.
+
+Usage: python benchmarks/synthetic.py OUTPUT_DIR [--plans N] [--accounts N] [--providers N] [--seed N]
+
+Plans are bootstrap-resampled from data/TreatmentPlans Data.csv, so band, payor,
+progress and fee mixes match the real data. Each synthetic plan keeps its source
+plan's NHS plan and claims (re-keyed). It is spread over `accounts` AccountIDs,
+gets one of `providers` lead providers, and has its completion dates shifted by up
+to a year. Files are written in chunks, so 10M plans only need one chunk in memory.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_loader import SOURCE_FILES, source_path  # noqa: E402
+
+CHUNK_PLANS = 500_000
+MAX_DATE_SHIFT_DAYS = 365
+
+FIRST_ACCOUNT_ID = 800000
+FIRST_PLAN_ID = 1_000_000
+FIRST_CLAIM_REFERENCE = 10_000_000
+
+
+def _provider_pool(treatment_plans, providers):
+    """The real lead-provider codes, topped up with made-up two-letter codes to `providers` entries."""
+    leads = treatment_plans["TreatmentProviders"].str.partition(";")[0]
+    weights = leads.value_counts(normalize=True)
+    codes = weights.index.tolist()[:providers]
+    extra = [f"{chr(ord('A') + i // 26)}{chr(ord('A') + i % 26)}" for i in range(26 * 26)]
+    codes += [code for code in extra if code not in codes][:max(0, providers - len(codes))]
+    # Extra providers share the load evenly with the real ones
+    probabilities = np.array([weights.get(code, 1 / len(codes)) for code in codes])
+    return codes, probabilities / probabilities.sum()
+
+
+def _shift_dates(values, offsets, fmt):
+    parsed = pd.to_datetime(values, format=fmt, errors="coerce")
+    shifted = (parsed + pd.to_timedelta(offsets, unit="D")).dt.strftime(fmt)
+    # Sentinels such as "No Codes Completed" are kept verbatim
+    return shifted.where(parsed.notna(), values)
+
+
+def generate_chunk(sources, rng, first_index, size, accounts, providers):
+    treatment_plans, nhs_plans, claims = sources
+    picks = rng.integers(0, len(treatment_plans), size)
+    plans = treatment_plans.iloc[picks].reset_index(drop=True)
+    source_ids = plans["TreatmentPlanID"].to_numpy()
+    plan_ids = FIRST_PLAN_ID + first_index + np.arange(size)
+
+    plans["TreatmentPlanID"] = plan_ids
+    plans["AccountID"] = FIRST_ACCOUNT_ID + rng.integers(0, accounts, size)
+
+    codes, probabilities = providers
+    # Only the lead provider (the PlanProvider) is replaced; the rest of the list is kept
+    parts = plans["TreatmentProviders"].str.partition(";")
+    leads = np.array(codes, dtype=object)[rng.choice(len(codes), size, p=probabilities)]
+    plans["TreatmentProviders"] = leads + parts[1] + parts[2]
+
+    offsets = rng.integers(-MAX_DATE_SHIFT_DAYS, 1, size)
+    plans["FirstCompletion"] = _shift_dates(plans["FirstCompletion"], offsets, "%Y-%m-%d")
+    plans["LastCompletion"] = _shift_dates(plans["LastCompletion"], offsets, "%Y-%m-%d")
+    plans["CreatedDate"] = _shift_dates(plans["CreatedDate"], offsets, "%d/%m/%Y")
+
+    mapping = pd.DataFrame({"SourcePlanID": source_ids, "NewPlanID": plan_ids})
+    nhs = mapping.merge(nhs_plans, left_on="SourcePlanID", right_on="TreatmentPlanID")
+    nhs["TreatmentPlanID"] = nhs["NewPlanID"]
+    nhs = nhs[nhs_plans.columns]
+
+    plan_claims = mapping.merge(claims, left_on="SourcePlanID", right_on="TreatmentPlanId")
+    plan_claims["TreatmentPlanId"] = plan_claims["NewPlanID"]
+    plan_claims = plan_claims[claims.columns]
+    return plans, nhs, plan_claims
+
+
+def generate(output_dir, plans, accounts=50, providers=12, seed=0, chunk_plans=CHUNK_PLANS):
+    """Write the three synthetic CSVs (named as in data/) to `output_dir` and return their row counts."""
+    treatment_plans = pd.read_csv(source_path("treatment_plans"))
+    sources = (treatment_plans, pd.read_csv(source_path("nhs_plans")), pd.read_csv(source_path("claims")))
+    pool = _provider_pool(treatment_plans, providers)
+    rng = np.random.default_rng(seed)
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {name: os.path.join(output_dir, filename) for name, filename in SOURCE_FILES.items()}
+    rows = dict.fromkeys(SOURCE_FILES, 0)
+    next_claim_reference = FIRST_CLAIM_REFERENCE
+
+    for first_index in range(0, plans, chunk_plans):
+        size = min(chunk_plans, plans - first_index)
+        chunk_plans_frame, nhs, plan_claims = generate_chunk(sources, rng, first_index, size, accounts, pool)
+        plan_claims["ClaimReferenceNumber"] = next_claim_reference + np.arange(len(plan_claims))
+        next_claim_reference += len(plan_claims)
+
+        header = first_index == 0
+        for name, frame in [("treatment_plans", chunk_plans_frame), ("nhs_plans", nhs), ("claims", plan_claims)]:
+            frame.to_csv(paths[name], mode="w" if header else "a", header=header, index=False)
+            rows[name] += len(frame)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output_dir")
+    parser.add_argument("--plans", type=int, default=100_000)
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--providers", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = generate(args.output_dir, args.plans, args.accounts, args.providers, args.seed)
+    print(", ".join(f"{name}: {count:,} rows" for name, count in rows.items())
+          + f" in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
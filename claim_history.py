@@ -0,0 +1,91 @@
+"""Every claim on every plan, reconciled to one record per TreatmentPlanID.
+
+A plan whose claim came back "Failed" or "Invalid" is claimed again under a new
+ClaimReferenceNumber, so the claims extract can hold several rows per plan. Joining
+it to the plans as-is repeats the plan row once per claim and inflates every count
+and UDA sum. ClaimHistory hashes the claims on their plan id (pd.factorize), orders
+each plan's claims by submission date then reference number in one sort, and keeps
+CSR-style offsets per plan. latest() is then one row per plan (the most recent claim
+plus attempt counts) and chain() is a slice.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from classification import FAILED_CLAIM_STATUSES
+from columnar_cache import source_signature
+from data_loader import effective_path, read_source
+from date_parsing import parse_date_column
+
+
+CLAIM_COLUMNS = ["TreatmentPlanId", "ClaimReferenceNumber", "UDA", "ClaimStatus", "UdaConfirmed", "SubmittedOn"]
+
+SUBMITTED_FORMAT = "%Y-%m-%d"
+
+
+class ClaimHistory:
+    """Claims grouped by plan in submission order, with a hash index from plan id to its claims."""
+
+    def __init__(self, claims):
+        plan_codes, plan_ids = pd.factorize(claims["TreatmentPlanId"])
+        claims = claims.assign(SubmittedOn=self._submitted(claims))[plan_codes >= 0]
+        plan_codes = plan_codes[plan_codes >= 0]
+
+        # Undated claims (NaT is the smallest int64) sort before dated ones; reference numbers break ties
+        submitted = claims["SubmittedOn"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        order = np.lexsort((claims["ClaimReferenceNumber"].to_numpy(), submitted, plan_codes))
+        self.attempts = np.bincount(plan_codes, minlength=len(plan_ids))
+        self.indptr = np.concatenate([[0], np.cumsum(self.attempts)])
+
+        self.claims = claims.iloc[order].reset_index(drop=True)
+        self.claims["Attempt"] = np.arange(len(order)) - np.repeat(self.indptr[:-1], self.attempts) + 1
+        self.plan_ids = pd.Index(plan_ids, name="TreatmentPlanID")
+        self._plan_codes = plan_codes[order]
+
+    @staticmethod
+    def _submitted(claims):
+        if "SubmittedOn" not in claims.columns:
+            return pd.Series(pd.NaT, index=claims.index, dtype="datetime64[ns]")
+        if pd.api.types.is_datetime64_dtype(claims["SubmittedOn"]):
+            return claims["SubmittedOn"]
+        return parse_date_column(claims["SubmittedOn"], SUBMITTED_FORMAT)[0]
+
+    def latest(self):
+        """One row per plan: its most recent claim, ClaimAttempts and FailedAttempts, keyed by TreatmentPlanID."""
+        failed = self.claims["ClaimStatus"].isin(FAILED_CLAIM_STATUSES).to_numpy()
+        records = self.claims.iloc[self.indptr[1:] - 1].drop(columns="Attempt").reset_index(drop=True)
+        records["ClaimAttempts"] = self.attempts
+        records["FailedAttempts"] = np.bincount(self._plan_codes[failed], minlength=len(self.plan_ids))
+        return records.rename(columns={"TreatmentPlanId": "TreatmentPlanID"})
+
+    def chain(self, plan_id):
+        """The plan's claims, first submission first (empty when it has none)."""
+        if plan_id not in self.plan_ids:
+            return self.claims.iloc[:0]
+        code = self.plan_ids.get_loc(plan_id)
+        return self.claims.iloc[self.indptr[code]:self.indptr[code + 1]]
+
+    def resubmitted_plans(self):
+        """TreatmentPlanIDs claimed more than once."""
+        return self.plan_ids[self.attempts > 1].to_numpy()
+
+
+def reconcile_claims(claims):
+    """The latest claim per plan with its attempt counts (see ClaimHistory.latest)."""
+    return ClaimHistory(claims).latest()
+
+
+_history_lock = threading.Lock()
+_history = {"signature": None, "history": None}
+
+
+def load_claim_history():
+    """ClaimHistory for the claims on disk, rebuilt only when that extract changes."""
+    path = effective_path("claims")
+    signature = [os.path.basename(path)] + source_signature(path)
+    with _history_lock:
+        if _history["signature"] != signature:
+            _history.update(signature=signature, history=ClaimHistory(read_source("claims", CLAIM_COLUMNS)))
+        return _history["history"]
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+
+band_to_udas = {
+    'Band2': 3,
+    'Band1': 1,
+    'Band2b': 5,
+    'Band3': 12,
+    'Band4': 1.2,
+    'Band2c': 7
+}
+
+FAILED_CLAIM_STATUSES = ["Invalid", "Failed"]
+QUEUED_CLAIM_STATUSES = ["Submitted", "Queued"]
+
+NO_ACTION = "No Action"
+CLAIM_FAILED = "Claim Invalid or Failed"
+CLAIM_NOT_RAISED = "Claim Not Raised"
+
+
+def _flag(mask, missing):
+    # 0/1 flag as a nullable Int8, with <NA> where the old row-wise helpers returned ""
+    return pd.arrays.IntegerArray(mask.astype(np.int8), missing.copy())
+
+
+def _numbers(series):
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+
+def classify_plans(df):
+    """Derive the plan, claim and action flags for a treatment/NHS/claims merged frame in one pass.
+
+    Columns are added in place and the frame is returned. The rules match the former
+    checkMixed/checkPrivateNHS/calculateCompleted/... helpers, but flags are Int8 with
+    <NA> instead of "" for plans without a provider or rows without a claim.
+    """
+    provider = df["PlanProvider"]
+    no_provider = provider.isna().to_numpy()
+    blank_provider = provider.eq("").to_numpy()
+
+    nhs_codes = _numbers(df["TotalNHSCodes"])
+    total = _numbers(df["TotalTreatments"])
+    completed = _numbers(df["CompletedTreatments"])
+
+    has_nhs_codes = nhs_codes > 0
+    mixed = has_nhs_codes & (nhs_codes < total)
+    pure_nhs = has_nhs_codes & (nhs_codes == total)
+    full_private = np.isnan(nhs_codes)
+
+    started = completed != 0
+    in_progress = started & (completed < total)
+    complete = started & (completed == total)
+
+    df["isMixed"] = _flag(mixed, blank_provider)
+    df["isPNHS"] = _flag(pure_nhs, blank_provider)
+    df["isFullPrivate"] = _flag(full_private, blank_provider)
+    df["inProgress"] = _flag(in_progress, blank_provider)
+    df["Complete"] = _flag(complete, blank_provider)
+    df["PendingFee"] = np.where(
+        blank_provider, np.nan, _numbers(df["TotalFee"]) - _numbers(df["CompletedTreatmentsFee"]))
+    df["isNHS"] = _flag(mixed | pure_nhs, blank_provider)
+
+    claim_status = df["ClaimStatus"]
+    no_claim = claim_status.isna().to_numpy()
+    claim_failed = claim_status.isin(FAILED_CLAIM_STATUSES).to_numpy()
+    claim_queued = claim_status.isin(QUEUED_CLAIM_STATUSES).to_numpy()
+
+    df["isClaimFailed"] = _flag(claim_failed, no_claim)
+    df["isClaimQueued"] = _flag(claim_queued, no_claim)
+
+    # Failed claims always need action; completed NHS work needs a claim raising
+    nhs_complete = (mixed | pure_nhs) & complete & ~blank_provider
+    requires_action = claim_failed | (nhs_complete & no_claim)
+    df["plansThatRequireAction"] = _flag(requires_action, no_provider)
+
+    # astype(float) because mapping a categorical Band yields a categorical
+    df["UDAs"] = df["Band_x"].map(band_to_udas).astype(float)
+
+    df["whatAction"] = np.select(
+        [no_provider, ~requires_action, claim_failed],
+        ["", NO_ACTION, CLAIM_FAILED],
+        default=CLAIM_NOT_RAISED,
+    ).astype(object)
+
+    return df
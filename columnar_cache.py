@@ -0,0 +1,133 @@
+import json
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# Low-cardinality columns stored as dictionary-encoded categoricals
+CATEGORICAL_COLUMNS = ["AccountID", "Payor", "Band", "ClaimStatus"]
+
+SIGNATURE_KEY = b"dashboard.source_signature"
+ATTRS_KEY = b"dashboard.attrs"
+
+
+def columnar_path(source_path):
+    directory, filename = os.path.split(source_path)
+    return os.path.join(directory, ".cache", f"{os.path.splitext(filename)[0]}.parquet")
+
+
+def source_signature(source_path):
+    stat = os.stat(source_path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def to_columnar_dtypes(frame):
+    for column in CATEGORICAL_COLUMNS:
+        if column in frame.columns:
+            frame[column] = frame[column].astype("category")
+    return frame
+
+
+def write_parquet(path, frame, signature):
+    """Write `frame` to `path` stamped with `signature`, a JSON-serialisable description of its inputs."""
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SIGNATURE_KEY] = json.dumps(signature).encode()
+    metadata[ATTRS_KEY] = json.dumps(frame.attrs).encode()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write then rename so readers never see a half-written file
+    pq.write_table(table.replace_schema_metadata(metadata), path + ".tmp")
+    os.replace(path + ".tmp", path)
+    return path
+
+
+# Signatures read from Parquet footers, reused while the file's stat is unchanged
+_stored_signatures = {}
+
+
+def stored_signature(path):
+    """The signature `path` was written with, or None; only re-reads the footer when the file changed."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    # write_parquet replaces the file, so a rewrite always changes the inode or mtime
+    key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    cached = _stored_signatures.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    stored = metadata.get(SIGNATURE_KEY)
+    signature = json.loads(stored) if stored is not None else None
+    _stored_signatures[path] = (key, signature)
+    return signature
+
+
+def read_parquet(path, columns=None):
+    parquet_file = pq.ParquetFile(path)
+    table = parquet_file.read(columns=columns)
+    frame = table.to_pandas()
+    # Parquet only round-trips string dictionaries, so re-apply the other categoricals pandas recorded
+    for column in (table.schema.pandas_metadata or {}).get("columns", []):
+        if column["pandas_type"] == "categorical" and column["name"] in frame.columns:
+            frame[column["name"]] = frame[column["name"]].astype("category")
+    # The file's key-value metadata also holds attrs added after streaming (see write_columnar_chunks)
+    frame.attrs = json.loads((parquet_file.metadata.metadata or {}).get(ATTRS_KEY, b"{}"))
+    return frame
+
+
+def write_columnar(source_path, frame):
+    """Store `frame` as the Parquet cache of `source_path`, stamped with the source's mtime and size."""
+    return write_parquet(columnar_path(source_path), to_columnar_dtypes(frame), source_signature(source_path))
+
+
+def _stream_schema(schema, metadata):
+    """`schema` with room for every chunk: int32 dictionary indices, and string for all-null columns."""
+    fields = []
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            field = field.with_type(pa.dictionary(pa.int32(), field.type.value_type))
+        elif pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field)
+    return pa.schema(fields, metadata={**(schema.metadata or {}), **metadata})
+
+
+def write_columnar_chunks(source_path, chunks):
+    """Stream `chunks` (frames with the same columns and dtypes) into the Parquet cache of
+    `source_path`, one row group per chunk, stamped like write_columnar.
+
+    Only one chunk is held at a time. The schema is fixed by the first chunk, and the attrs
+    of the last chunk are stored. Returns the cache path and the number of rows written.
+    """
+    path = columnar_path(source_path)
+    signature = {SIGNATURE_KEY: json.dumps(source_signature(source_path)).encode()}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    writer, rows, attrs = None, 0, {}
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(to_columnar_dtypes(chunk), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path + ".tmp", _stream_schema(table.schema, signature))
+            writer.write_table(table.cast(writer.schema))
+            rows, attrs = rows + len(chunk), chunk.attrs
+        writer.add_key_value_metadata({ATTRS_KEY: json.dumps(attrs).encode()})
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(path + ".tmp", path)
+    return path, rows
+
+
+def is_fresh(source_path):
+    return stored_signature(columnar_path(source_path)) == source_signature(source_path)
+
+
+def read_columnar(source_path, columns=None):
+    """Read the cached table, loading only `columns` from disk when given."""
+    return read_parquet(columnar_path(source_path), columns)
@@ -0,0 +1,240 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from columnar_cache import columnar_path, is_fresh, read_parquet
+from date_parsing import DATE_COLUMNS, parse_dates
+
+
+logger = logging.getLogger(__name__)
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+SOURCE_FILES = {
+    "treatment_plans": "TreatmentPlans Data.csv",
+    "claims": "Claims Data.csv",
+    "nhs_plans": "NHS Plans Data.csv",
+}
+
+# Upper bound for parsed frames kept in memory, shared by every session of the process
+MAX_CACHE_BYTES = int(os.environ.get("DASHBOARD_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+# Working memory for parsing CSVs, split between the files read concurrently; sets the chunk size
+MAX_INGEST_BYTES = int(os.environ.get("DASHBOARD_INGEST_MEMORY_MB", "256")) * 1024 * 1024
+SAMPLE_ROWS = 1000
+MIN_CHUNK_ROWS = 10_000
+
+# Parse types for the columns the dashboard reads, so pandas neither infers them from the whole
+# file nor disagrees between chunks. Counts and amounts are float so a blank cell cannot abort a load.
+# Other columns are left to pandas' inference.
+SOURCE_DTYPES = {
+    "treatment_plans": {
+        "AccountID": "int64", "CreatedIn": str, "CreatedDate": str, "TreatmentPlanID": "int64",
+        "Band": "category", "Payor": "category", "TreatmentProviders": str, "FirstCompletion": str,
+        "LastCompletion": str, "TotalTreatments": "float64", "CompletedTreatments": "float64",
+        "TotalFee": "float64", "CompletedTreatmentsFee": "float64",
+    },
+    "claims": {
+        "TreatmentPlanId": "int64", "ClaimReferenceNumber": "int64", "UDA": "float64",
+        "ClaimStatus": "category", "UdaConfirmed": "float64", "SubmittedOn": str,
+    },
+    "nhs_plans": {"TreatmentPlanID": "int64", "TotalNHSCodes": "float64", "Band": "category"},
+}
+
+
+def source_path(name, data_dir=DATA_DIR):
+    return os.path.join(data_dir, SOURCE_FILES[name])
+
+
+def file_signature(path):
+    # A file is considered unchanged while its path, mtime and size all match
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+class FrameCache:
+    """Process-wide LRU cache of parsed files, invalidated when the file changes on disk."""
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, path, reader, kind="raw"):
+        # `kind` lets derived frames (e.g. parsed dates) share the source file's invalidation
+        signature = file_signature(path)
+        key = (signature[0], kind)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["signature"] == signature:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry["frame"]
+            if entry is not None:
+                # File was modified or replaced since it was cached
+                self.invalidations += 1
+                del self._entries[key]
+            self.misses += 1
+
+        frame = reader(path)
+        nbytes = int(frame.memory_usage(deep=True).sum())
+
+        with self._lock:
+            self._entries[key] = {"signature": signature, "frame": frame, "bytes": nbytes}
+            self._evict(keep=key)
+        return frame
+
+    def _evict(self, keep):
+        # Drop least recently used frames until we are back under budget, but never the one just read
+        while self.total_bytes() > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            del self._entries[oldest]
+            self.evictions += 1
+
+    def total_bytes(self):
+        return sum(entry["bytes"] for entry in self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes(),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+
+frame_cache = FrameCache()
+
+
+# Sources whose date columns are parsed at load time
+DATED_SOURCES = ["treatment_plans"]
+
+
+def _concat_chunks(chunks):
+    if len(chunks) == 1:
+        return chunks[0]
+    categoricals = [column for column in chunks[0].columns if isinstance(chunks[0][column].dtype, pd.CategoricalDtype)]
+    # Chunks have different categories, which a plain concat would turn into object columns
+    frame = pd.concat([chunk.drop(columns=categoricals) for chunk in chunks], ignore_index=True)
+    for column in categoricals:
+        frame[column] = union_categoricals([chunk[column] for chunk in chunks], sort_categories=True)
+    return frame[chunks[0].columns]
+
+
+def iter_csv_chunks(name, path, columns=None, max_bytes=MAX_INGEST_BYTES // len(SOURCE_FILES)):
+    """Parse one extract in chunks of at most about `max_bytes`, with explicit dtypes.
+
+    `columns` limits each chunk (and the columns parsed) to those names; a parsed date
+    column such as FirstCompletedDate pulls in its source column. Dates are parsed chunk
+    by chunk, and each chunk's attrs["parse_failures"] counts the failures so far.
+    """
+    dated = name in DATED_SOURCES
+    date_sources = {target: source for source, (target, _) in DATE_COLUMNS.items()} if dated else {}
+    usecols = None
+    if columns is not None:
+        wanted = {date_sources.get(column, column) for column in columns}
+        usecols = wanted.__contains__
+    options = {"usecols": usecols, "dtype": SOURCE_DTYPES.get(name)}
+
+    # Size chunks from a sample: parsing needs roughly twice the resident size of the rows
+    sample = pd.read_csv(path, nrows=SAMPLE_ROWS, **options)
+    row_bytes = max(1.0, sample.memory_usage(deep=True).sum() / max(1, len(sample)))
+    chunk_rows = max(MIN_CHUNK_ROWS, int(max_bytes / (2 * row_bytes)))
+
+    failures = {}
+
+    def prepare(chunk):
+        if dated:
+            dates = parse_dates(chunk)
+            for target in dates.columns:
+                chunk[target] = dates[target]
+            for column, count in dates.attrs["parse_failures"].items():
+                failures[column] = failures.get(column, 0) + count
+        if columns is not None:
+            chunk = chunk.reindex(columns=list(columns))
+        if dated:
+            chunk.attrs["parse_failures"] = dict(failures)
+        return chunk
+
+    empty = True
+    for chunk in pd.read_csv(path, chunksize=chunk_rows, **options):
+        empty = False
+        yield prepare(chunk)
+    if empty:
+        yield prepare(sample)
+    for column, count in failures.items():
+        if count:
+            logger.warning("%s: %d unparseable value(s) in %s", os.path.basename(path), count, column)
+
+
+def read_csv_chunked(name, path, columns=None, max_bytes=MAX_INGEST_BYTES // len(SOURCE_FILES)):
+    """One extract parsed with iter_csv_chunks and assembled into a single frame."""
+    chunks = list(iter_csv_chunks(name, path, columns, max_bytes))
+    frame = _concat_chunks(chunks)
+    frame.attrs = chunks[-1].attrs
+    return frame
+
+
+def read_csv_source(name, columns=None, data_dir=DATA_DIR):
+    """One extract parsed from its CSV, limited to `columns` when given."""
+    path = source_path(name, data_dir)
+    projection = tuple(columns) if columns is not None else None
+    # Callers get their own copy so in-place edits never leak into the shared cache
+    frame = frame_cache.get(path, lambda p: read_csv_chunked(name, p, projection), kind=("csv", projection))
+    return frame.copy()
+
+
+def read_source(name, columns=None, data_dir=DATA_DIR):
+    """One source extract, from the Parquet cache when it matches the CSV on disk.
+
+    `columns` limits the columns returned (and, for the Parquet cache, read from disk).
+    `data_dir` points at another set of extracts (e.g. the benchmarks' synthetic ones).
+    """
+    path = source_path(name, data_dir)
+    if is_fresh(path):
+        projection = tuple(columns) if columns is not None else None
+        # Keyed on the Parquet file itself, which incremental ingest rewrites without touching the CSV
+        frame = frame_cache.get(columnar_path(path), lambda p: read_parquet(p, columns), kind=projection)
+        return frame.copy()
+
+    return read_csv_source(name, columns, data_dir)
+
+
+def effective_path(name):
+    """The file load_data() actually reads for `name`: its Parquet cache when fresh, else the CSV."""
+    path = source_path(name)
+    return columnar_path(path) if is_fresh(path) else path
+
+
+def load_data(columns=None, data_dir=DATA_DIR):
+    """Load the three extracts; `columns` optionally maps a source name to the columns it needs."""
+    columns = columns or {}
+    # The extracts are independent, so they are read (and parsed) concurrently
+    with ThreadPoolExecutor(max_workers=len(SOURCE_FILES)) as pool:
+        frames = {name: pool.submit(read_source, name, columns.get(name), data_dir) for name in SOURCE_FILES}
+    return frames["treatment_plans"].result(), frames["claims"].result(), frames["nhs_plans"].result()
+
+
+def cache_stats():
+    return frame_cache.stats()
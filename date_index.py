@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+
+ALL_ACCOUNTS = "All"
+
+
+class DateIndex:
+    """Fact table rows ordered by LastCompletedDate, partitioned by account.
+
+    A Start/End Date lookup binary-searches the partition on LastCompletedDate and only
+    checks FirstCompletedDate on the rows inside that window. The fact table must not be
+    modified while the index is in use.
+    """
+
+    def __init__(self, fact):
+        self.fact = fact
+        last = fact["LastCompletedDate"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        first = fact["FirstCompletedDate"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        # NaT is the smallest int64, so undated rows sort to the front of each partition
+        missing_last = fact["LastCompletedDate"].isna().to_numpy()
+
+        order = np.argsort(last, kind="stable")
+        self._partitions = {ALL_ACCOUNTS: self._partition(order, last, first, missing_last)}
+
+        codes, accounts = pd.factorize(fact["AccountID"])
+        by_account = order[np.argsort(codes[order], kind="stable")]
+        bounds = np.searchsorted(codes[by_account], np.arange(len(accounts) + 1))
+        for code, account in enumerate(accounts.tolist()):
+            positions = by_account[bounds[code]:bounds[code + 1]]
+            self._partitions[account] = self._partition(positions, last, first, missing_last)
+
+        # The lower bound on LastCompletedDate is only safe if no plan finishes before it starts
+        self._last_bounds_first = bool(np.all((first <= last) | missing_last))
+
+    @staticmethod
+    def _partition(positions, last, first, missing_last):
+        return {
+            "positions": positions,
+            "last": last[positions],
+            "first": first[positions],
+            "undated": int(missing_last[positions].sum()),
+        }
+
+    def positions(self, account_id=ALL_ACCOUNTS, start_date=None, end_date=None, provider=None):
+        """Positional row numbers matching the filters, in LastCompletedDate order."""
+        positions = self._date_positions(account_id, start_date, end_date)
+        if provider is not None:
+            positions = positions[self.fact["PlanProvider"].to_numpy()[positions] == provider]
+        return positions
+
+    def _date_positions(self, account_id, start_date, end_date):
+        partition = self._partitions.get(account_id)
+        if partition is None:
+            return np.empty(0, dtype=np.intp)
+
+        lo, hi = 0, len(partition["positions"])
+        if end_date is not None:
+            lo = partition["undated"]
+            hi = np.searchsorted(partition["last"], pd.Timestamp(end_date).value, side="right")
+        if start_date is not None:
+            start = pd.Timestamp(start_date).value
+            if self._last_bounds_first:
+                lo = max(lo, np.searchsorted(partition["last"], start, side="left"))
+            window = slice(lo, max(lo, hi))
+            keep = partition["first"][window] >= start
+            return partition["positions"][window][keep]
+        return partition["positions"][lo:max(lo, hi)]
+
+    def select(self, account_id=ALL_ACCOUNTS, start_date=None, end_date=None, provider=None, date_order=False):
+        """Same rows as fact_table.apply_filters; `date_order=True` returns them sorted by LastCompletedDate."""
+        positions = self.positions(account_id, start_date, end_date, provider)
+        if not date_order:
+            positions = np.sort(positions)
+        return self.fact.take(positions)
+
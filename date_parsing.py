@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+
+NO_CODES_COMPLETED = "No Codes Completed"
+
+# Placeholder values that mean "no date" rather than a malformed date
+DATE_SENTINELS = [NO_CODES_COMPLETED]
+
+# Source column -> (parsed column, format used in the CareStack export)
+DATE_COLUMNS = {
+    "FirstCompletion": ("FirstCompletedDate", "%Y-%m-%d"),
+    "LastCompletion": ("LastCompletedDate", "%Y-%m-%d"),
+    "CreatedDate": ("CreatedDate", "%d/%m/%Y"),
+}
+
+
+def parse_date_column(values, date_format):
+    """Parse a column of date strings with one explicit format.
+
+    Returns the datetime64 series and the number of values that were neither
+    blank, a sentinel nor a valid date.
+    """
+    # Extracts repeat the same few hundred dates, so parse each distinct string once
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    sentinel = uniques.isin(DATE_SENTINELS).to_numpy()
+
+    parsed_uniques = pd.to_datetime(uniques.where(~sentinel), format=date_format, errors="coerce")
+    failed = parsed_uniques.isna().to_numpy() & ~sentinel
+
+    # factorize codes blanks as -1, so a trailing NaT/False slot maps them to "no date"
+    lookup = np.append(parsed_uniques.to_numpy(dtype="datetime64[ns]"), np.datetime64("NaT", "ns"))
+    parsed = pd.Series(lookup.take(codes), index=values.index, name=values.name)
+    failures = int(np.append(failed, False).take(codes).sum())
+    return parsed, failures
+
+
+def parse_dates(frame, columns=None):
+    columns = DATE_COLUMNS if columns is None else columns
+    dates = pd.DataFrame(index=frame.index)
+    failures = {}
+    for source, (target, date_format) in columns.items():
+        if source not in frame.columns:
+            continue
+        dates[target], failures[source] = parse_date_column(frame[source], date_format)
+    dates.attrs["parse_failures"] = failures
+    return dates
@@ -0,0 +1,132 @@
+import os
+import threading
+
+import pandas as pd
+
+from claim_history import CLAIM_COLUMNS, reconcile_claims
+from classification import classify_plans
+from columnar_cache import read_parquet, source_signature, stored_signature, write_parquet
+from data_loader import DATA_DIR, SOURCE_FILES, effective_path, load_data
+from instrumentation import stage
+from providers import hygiene_flags, lead_providers
+from schema import compact
+
+
+FACT_TABLE_PATH = os.path.join(DATA_DIR, ".cache", "fact_table.parquet")
+
+# Columns the fact table needs from each extract; the Parquet cache loads only these
+FACT_COLUMNS = {
+    "treatment_plans": [
+        "AccountID", "CreatedIn", "CreatedDate", "TreatmentPlanID", "Band", "Payor", "TreatmentProviders",
+        "FirstCompletedDate", "LastCompletedDate", "TotalTreatments", "CompletedTreatments", "TotalFee",
+        "CompletedTreatmentsFee",
+    ],
+    "claims": CLAIM_COLUMNS,
+    "nhs_plans": ["TreatmentPlanID", "TotalNHSCodes", "Band"],
+}
+
+# Completion dates before this year are placeholders (e.g. 1970-01-01) from the practice system
+MIN_VALID_YEAR = 2007
+
+
+def sources_signature():
+    # Signature of whichever file load_data() reads, so incremental updates to the Parquet cache count too
+    return {name: [os.path.basename(effective_path(name))] + source_signature(effective_path(name))
+            for name in SOURCE_FILES}
+
+
+def merge_extracts(treatment_plans, claims, nhs_plans):
+    """Treatment plans left-joined to their NHS plan and latest claim, with PlanProvider/HygienePlans added."""
+    # Lead provider and hygienist flag, parsed once per distinct TreatmentProviders value
+    treatment_plans['PlanProvider'] = lead_providers(treatment_plans['TreatmentProviders'])
+    treatment_plans['HygienePlans'] = hygiene_flags(treatment_plans['PlanProvider'])
+
+    treatment_nhs_merged_data = pd.merge(
+        treatment_plans,
+        nhs_plans,
+        on='TreatmentPlanID',
+        how='left'  # Retain all rows from TreatmentPlans.csv
+    )
+
+    # One record per plan (its latest claim), so resubmitted plans are not repeated
+    claims = reconcile_claims(claims).drop(columns="SubmittedOn")
+
+    merged = pd.merge(
+        treatment_nhs_merged_data,
+        claims,
+        on='TreatmentPlanID',
+        how='left'  # Retain all rows from TreatmentPlans.csv
+    )
+    # Plans never claimed have made no attempts
+    for column in ["ClaimAttempts", "FailedAttempts"]:
+        merged[column] = merged[column].fillna(0)
+    return merged
+
+
+def drop_placeholder_dates(fact):
+    # Filter out rows with invalid dates (1970 and greater than the current date)
+    fact = fact[
+        (fact['FirstCompletedDate'].dt.year >= MIN_VALID_YEAR) &
+        (fact['LastCompletedDate'].dt.year >= MIN_VALID_YEAR)
+        ]
+    return fact.reset_index(drop=True)
+
+
+def build_fact_table(treatment_plans, claims, nhs_plans):
+    """Merge the three extracts into one row per plan with every derived column the dashboard uses."""
+    with stage("merge"):
+        fact = merge_extracts(treatment_plans, claims, nhs_plans)
+
+    # Plan type, progress, claim status and action flags in a single vectorized pass
+    with stage("flag_derivation"):
+        fact = classify_plans(fact)
+
+    # Only the columns the dashboard reads, with categorical/narrow integer dtypes
+    fact = compact(drop_placeholder_dates(fact))
+    fact.attrs["parse_failures"] = dict(treatment_plans.attrs.get("parse_failures", {}))
+    return fact
+
+
+def materialize():
+    """Rebuild the fact table from the current extracts and persist it."""
+    signature = sources_signature()
+    with stage("load"):
+        sources = load_data(FACT_COLUMNS)
+    fact = build_fact_table(*sources)
+    write_parquet(FACT_TABLE_PATH, fact, signature)
+    return fact, signature
+
+
+_fact_lock = threading.Lock()
+_fact = {"signature": None, "frame": None}
+
+
+def load_fact_table():
+    """The enriched fact table for the extracts currently on disk.
+
+    Held in memory for the process, re-read from the persisted copy after a restart,
+    and rebuilt only when one of the source files changes. Treat the result as read-only.
+    """
+    signature = sources_signature()
+    with _fact_lock:
+        if _fact["signature"] != signature:
+            if stored_signature(FACT_TABLE_PATH) == signature:
+                fact = read_parquet(FACT_TABLE_PATH)
+            else:
+                fact, signature = materialize()
+            _fact.update(signature=signature, frame=fact)
+        return _fact["frame"]
+
+
+def apply_filters(fact, account_id="All", start_date=None, end_date=None, provider=None):
+    """Rows of the fact table matching the sidebar filters, as a new frame."""
+    mask = pd.Series(True, index=fact.index)
+    if start_date is not None:
+        mask &= fact['FirstCompletedDate'] >= pd.Timestamp(start_date)
+    if end_date is not None:
+        mask &= fact['LastCompletedDate'] <= pd.Timestamp(end_date)
+    if account_id != "All":
+        mask &= fact["AccountID"] == account_id
+    if provider is not None:
+        mask &= fact["PlanProvider"] == provider
+    return fact[mask]
@@ -0,0 +1,128 @@
+"""Process-wide cache of Plotly figures, keyed by the data they are drawn from.
+
+A figure is built once per distinct input (chart name, a hash of the aggregated data
+and any other parameters) and then shared by every rerun and every session that asks
+for the same chart, whatever filters produced the data. This saves building the
+figure (plotly express validation and layout), not serializing it: st.plotly_chart
+still converts the figure to JSON on every rerun. Cached figures are shared, so
+callers must not modify them.
+"""
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import stage
+
+
+MAX_FIGURE_CACHE_BYTES = int(os.environ.get("DASHBOARD_FIGURE_CACHE_MB", "32")) * 1024 * 1024
+
+# Time series longer than this are downsampled before plotting
+MAX_CHART_POINTS = int(os.environ.get("DASHBOARD_MAX_CHART_POINTS", "500"))
+
+
+def content_key(*parts):
+    """Hash of frames/series (values, index and column names) and plain parameters."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+            names = list(part.columns) if isinstance(part, pd.DataFrame) else [part.name]
+            digest.update(repr(names).encode())
+        else:
+            digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+
+def data_bytes(*parts):
+    """Memory held by frames/series and plain parameters, used as the size of a figure drawn from them."""
+    total = 0
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            total += int(part.memory_usage(index=True, deep=True).sum())
+        elif isinstance(part, pd.Series):
+            total += int(part.memory_usage(index=True, deep=True))
+        else:
+            total += sys.getsizeof(part)
+    return total
+
+
+def downsample(frame, max_points=MAX_CHART_POINTS):
+    """At most `max_points` rows of a series frame (one row per period, one column per metric).
+
+    Rows are split into equal buckets and, in each, the rows holding every column's
+    minimum and maximum are kept, along with the first and last row, so peaks and
+    dips survive. Shorter frames are returned unchanged.
+    """
+    if len(frame) <= max_points:
+        return frame
+    values = frame.to_numpy(dtype=float)
+    n_buckets = max(1, (max_points - 2) // (2 * values.shape[1]))
+    edges = np.linspace(0, len(frame), n_buckets + 1).astype(int)
+    keep = {0, len(frame) - 1}
+    for start, stop in zip(edges[:-1], edges[1:]):
+        bucket = values[start:stop]
+        keep.update(start + bucket.argmin(axis=0))
+        keep.update(start + bucket.argmax(axis=0))
+    return frame.iloc[sorted(keep)]
+
+
+class FigureCache:
+    """LRU cache of built figures, bounded by the size of the data each was drawn from."""
+
+    def __init__(self, max_bytes=MAX_FIGURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, name, key, build, nbytes):
+        """The figure `build()` returns for chart `name` drawn from data hashed to `key`
+        and taking about `nbytes`."""
+        entry_key = (name, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(entry_key)
+                return entry["figure"]
+            self.misses += 1
+
+        with stage(f"figure:{name}"):
+            figure = build()
+
+        with self._lock:
+            if nbytes <= self.max_bytes:
+                self._entries[entry_key] = {"figure": figure, "bytes": nbytes}
+                while self.total_bytes() > self.max_bytes:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return figure
+
+    def total_bytes(self):
+        return sum(entry["bytes"] for entry in self._entries.values())
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes(),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+figure_cache = FigureCache()
+
+
+def cached_figure(name, build, *data):
+    """Chart `name` for `data` (frames and parameters), built with `build()` only the first time."""
+    return figure_cache.get(name, content_key(*data), build, data_bytes(*data))
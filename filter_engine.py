@@ -0,0 +1,129 @@
+import logging
+import re
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import (
+    is_datetime64_any_dtype,
+    is_numeric_dtype,
+    is_object_dtype,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Columns with fewer distinct values than this are filtered with a multiselect
+MAX_MULTISELECT_VALUES = 10
+
+
+class DatasetProfile:
+    """Column types, widget options and factorized values of a frame, worked out once per dataset.
+
+    Object columns that parse as dates are converted (and tz-aware dates made naive), as
+    filter_dataframe() used to do on every rerun. Treat `frame` as read-only.
+    """
+
+    def __init__(self, df):
+        converted = {}
+        for col in df.columns:
+            values = df[col]
+            if is_object_dtype(values):
+                try:
+                    values = converted[col] = pd.to_datetime(values)
+                except Exception:
+                    pass
+            if is_datetime64_any_dtype(values) and values.dt.tz is not None:
+                converted[col] = values.dt.tz_localize(None)
+        # Copy only when a column actually changed type
+        self.frame = df.assign(**converted) if converted else df
+
+        self.kinds = {}
+        self.options = {}
+        self.bounds = {}
+        self._codes = {}
+        for col in self.frame.columns:
+            values = self.frame[col]
+            if isinstance(values.dtype, pd.CategoricalDtype) or values.nunique() < MAX_MULTISELECT_VALUES:
+                self.kinds[col] = "categorical"
+                self.options[col] = values.unique()
+            elif is_numeric_dtype(values):
+                self.kinds[col] = "numeric"
+                self.bounds[col] = (float(values.min()), float(values.max()))
+            elif is_datetime64_any_dtype(values):
+                self.kinds[col] = "datetime"
+                self.bounds[col] = (values.min(), values.max())
+            else:
+                self.kinds[col] = "text"
+
+    @property
+    def nbytes(self):
+        # The frame dominates; widget options and factorized codes are at most a few arrays per column
+        arrays = list(self.options.values()) + [array for pair in self._codes.values() for array in pair]
+        return int(self.frame.memory_usage(deep=True).sum()) + sum(array.nbytes for array in arrays)
+
+    def codes(self, col):
+        # Factorized once per column, on first use: isin and regex then work on the distinct values only
+        if col not in self._codes:
+            values = self.frame[col]
+            if self.kinds[col] == "text":
+                values = values.astype(str)
+            codes, uniques = pd.factorize(values)
+            self._codes[col] = (codes, pd.Index(uniques))
+        return self._codes[col]
+
+
+def _lookup(codes, allowed_uniques, allow_missing):
+    # Boolean per distinct value, indexed by code; code -1 (missing) maps to the extra last slot
+    table = np.append(allowed_uniques, allow_missing)
+    return table[codes]
+
+
+def compile_predicate(profile, predicate):
+    """Turn one spec entry into a function returning a boolean mask over `profile.frame`.
+
+    Spec entries are dicts with a `column`, an `op` and a `value`:
+      isin     -- value is the list of selected values
+      between  -- value is an inclusive (low, high) pair of numbers or timestamps
+      contains -- value is a regular expression searched in the column's text
+    """
+    column, op, value = predicate["column"], predicate["op"], predicate["value"]
+    frame = profile.frame
+
+    if op == "isin":
+        codes, uniques = profile.codes(column)
+        allowed = uniques.isin(value)
+        allow_missing = any(pd.isna(v) for v in value)
+        return lambda: _lookup(codes, allowed, allow_missing)
+
+    if op == "between":
+        low, high = value
+        values = frame[column]
+        return lambda: values.between(low, high).to_numpy(dtype=bool, na_value=False)
+
+    if op == "contains":
+        pattern = re.compile(value)
+        codes, uniques = profile.codes(column)
+        matches = np.array([pattern.search(text) is not None for text in uniques], dtype=bool)
+        return lambda: _lookup(codes, matches, False)
+
+    raise ValueError(f"Unknown filter op {op!r} for column {column!r}")
+
+
+def filter_frame(profile, spec):
+    """Rows of `profile.frame` matching every predicate in `spec`, combined into one mask.
+
+    Returns the filtered frame and a list of (column, op, seconds) timings, one per predicate.
+    """
+    mask = np.ones(len(profile.frame), dtype=bool)
+    timings = []
+    for predicate in spec:
+        start = time.perf_counter()
+        mask &= compile_predicate(profile, predicate)()
+        elapsed = time.perf_counter() - start
+        timings.append((predicate["column"], predicate["op"], elapsed))
+        logger.debug("filter %s %s: %.2f ms", predicate["column"], predicate["op"], elapsed * 1000)
+
+    if mask.all():
+        return profile.frame, timings
+    return profile.frame[mask], timings
@@ -0,0 +1,99 @@
+import pandas as pd
+
+from columnar_cache import is_fresh, read_columnar, read_parquet, stored_signature, write_columnar, write_parquet
+from data_loader import DATED_SOURCES, SOURCE_DTYPES, source_path
+from date_parsing import DATE_COLUMNS, parse_dates
+from fact_table import FACT_COLUMNS, FACT_TABLE_PATH, build_fact_table, materialize, sources_signature
+
+
+# Key identifying a row in each extract; a delta row replaces the stored row with the same key
+SOURCE_KEYS = {
+    "treatment_plans": "TreatmentPlanID",
+    "claims": "ClaimReferenceNumber",
+    "nhs_plans": "TreatmentPlanID",
+}
+
+# Column holding the plan a row belongs to
+PLAN_COLUMNS = {
+    "treatment_plans": "TreatmentPlanID",
+    "claims": "TreatmentPlanId",
+    "nhs_plans": "TreatmentPlanID",
+}
+
+
+def read_delta(name, path):
+    """Read a delta CSV exported in the same layout as the full extract."""
+    delta = pd.read_csv(path, dtype=SOURCE_DTYPES.get(name))
+    if name in DATED_SOURCES:
+        dates = parse_dates(delta)
+        for target, _ in DATE_COLUMNS.values():
+            delta[target] = dates[target]
+    return delta
+
+
+def upsert(base, delta, key):
+    delta = delta.drop_duplicates(key, keep="last").reindex(columns=base.columns)
+    kept = base[~base[key].isin(delta[key])]
+    # Categoricals with different categories concat to object; write_columnar re-encodes them
+    categoricals = {column: object for column in kept.select_dtypes("category")}
+    return pd.concat([kept.astype(categoricals), delta], ignore_index=True)
+
+
+def apply_deltas(deltas, ingest_missing=True):
+    """Upsert delta frames into the Parquet store and refresh only the fact rows of touched plans.
+
+    `deltas` maps a source name to a frame of new or changed rows. The CSV snapshots are left
+    alone; the next full snapshot (and `python ingest.py`) supersedes every applied delta.
+    Returns the set of TreatmentPlanIDs whose fact rows were recomputed.
+    """
+    for name in deltas:
+        if not is_fresh(source_path(name)):
+            if not ingest_missing:
+                raise RuntimeError(f"No up-to-date Parquet cache for {name}; run `python ingest.py` first")
+            # Imported here as ingest.py itself imports this module
+            from ingest import ingest
+            ingest([name])
+
+    # Splicing is only valid on top of a fact table built from the current store
+    fact_is_current = stored_signature(FACT_TABLE_PATH) == sources_signature()
+
+    touched = set()
+    for name, delta in deltas.items():
+        path = source_path(name)
+        base = read_columnar(path)
+        key = SOURCE_KEYS[name]
+        plan_column = PLAN_COLUMNS[name]
+
+        # Plans gaining a row, plus plans losing one (e.g. a claim re-filed against another plan)
+        touched.update(delta[plan_column].tolist())
+        touched.update(base.loc[base[key].isin(delta[key]), plan_column].tolist())
+
+        updated = upsert(base, delta, key)
+        updated.attrs = base.attrs
+        write_columnar(path, updated)
+
+    if fact_is_current:
+        _refresh_fact_rows(touched)
+    else:
+        materialize()
+    return touched
+
+
+def _refresh_fact_rows(touched):
+    sources = {}
+    for name, columns in FACT_COLUMNS.items():
+        frame = read_columnar(source_path(name), columns)
+        sources[name] = frame[frame[PLAN_COLUMNS[name]].isin(touched)].reset_index(drop=True)
+
+    # Derived columns (Complete, isNHS, UDAs, whatAction, ...) are computed for touched plans only
+    fresh_rows = build_fact_table(sources["treatment_plans"], sources["claims"], sources["nhs_plans"])
+
+    fact = read_parquet(FACT_TABLE_PATH)
+    untouched = fact[~fact["TreatmentPlanID"].isin(touched)]
+    categoricals = {column: object for column in untouched.select_dtypes("category")}
+    updated = pd.concat([untouched.astype(categoricals), fresh_rows.astype(categoricals)], ignore_index=True)
+    for column in categoricals:
+        updated[column] = updated[column].astype("category")
+    updated.attrs = fact.attrs
+    write_parquet(FACT_TABLE_PATH, updated, sources_signature())
+    return updated
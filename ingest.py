@@ -0,0 +1,79 @@
+"""Convert the CSV extracts into the typed Parquet cache read by load_data().
+
+Usage: python ingest.py [treatment_plans] [claims] [nhs_plans]
+       python ingest.py --claims-delta new_claims.csv [--treatment-plans-delta ...] [--nhs-plans-delta ...]
+
+With no arguments every source is converted, keeping the columns the fact table reads
+(FACT_COLUMNS). Re-run after replacing a CSV;
+until then load_data() falls back to parsing the CSV. The merged fact table and
+claim history are rebuilt afterwards so the dashboard's first rerun does not have to.
+
+The --*-delta options upsert daily delta files (same layout as the full
+extracts) into the cache instead, recomputing only the plans they touch.
+"""
+import argparse
+import os
+import time
+
+from claim_history import load_claim_history
+from columnar_cache import write_columnar_chunks
+from data_loader import DATA_DIR, MAX_INGEST_BYTES, SOURCE_FILES, iter_csv_chunks, source_path
+from fact_table import FACT_COLUMNS, materialize
+from incremental import apply_deltas, read_delta
+
+
+def ingest_source(name, data_dir=DATA_DIR):
+    """Stream one extract's CSV into its Parquet cache, chunk by chunk, keeping only the fact table's columns."""
+    start = time.perf_counter()
+    csv_path = source_path(name, data_dir)
+    chunks = iter_csv_chunks(name, csv_path, FACT_COLUMNS[name], MAX_INGEST_BYTES)
+    path, rows = write_columnar_chunks(csv_path, chunks)
+    return {
+        "rows": rows,
+        "csv_bytes": os.path.getsize(csv_path),
+        "parquet_bytes": os.path.getsize(path),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def ingest(names=None, data_dir=DATA_DIR):
+    # One source at a time, so each chunk can use the whole ingest memory budget
+    return {name: ingest_source(name, data_dir) for name in (names or SOURCE_FILES)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sources", nargs="*", help=f"any of {', '.join(SOURCE_FILES)} (default: all)")
+    for name in SOURCE_FILES:
+        parser.add_argument(f"--{name.replace('_', '-')}-delta", metavar="CSV", help=f"upsert new/changed {name} rows")
+    args = parser.parse_args()
+    unknown = set(args.sources) - set(SOURCE_FILES)
+    if unknown:
+        parser.error(f"unknown source(s): {', '.join(sorted(unknown))}")
+
+    delta_paths = {name: getattr(args, f"{name}_delta") for name in SOURCE_FILES if getattr(args, f"{name}_delta")}
+    if delta_paths:
+        start = time.perf_counter()
+        deltas = {name: read_delta(name, path) for name, path in delta_paths.items()}
+        touched = apply_deltas(deltas)
+        rows = sum(len(delta) for delta in deltas.values())
+        print(f"applied {rows:,} delta rows, {len(touched):,} plans recomputed in {time.perf_counter() - start:.2f}s")
+        return
+
+    for name, result in ingest(args.sources).items():
+        print(f"{name}: {result['rows']:,} rows, {result['csv_bytes']:,} -> {result['parquet_bytes']:,} bytes "
+              f"in {result['seconds']:.2f}s")
+
+    start = time.perf_counter()
+    fact, _ = materialize()
+    print(f"fact table: {len(fact):,} rows, {fact.memory_usage(deep=True).sum():,} bytes in memory "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    history = load_claim_history()
+    print(f"claim history: {len(history.claims):,} claims on {len(history.plan_ids):,} plans, "
+          f"{len(history.resubmitted_plans()):,} resubmitted in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
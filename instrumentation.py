@@ -0,0 +1,98 @@
+"""Wall time, CPU time and peak memory per pipeline stage.
+
+Off unless DASHBOARD_INSTRUMENTATION=1. When off, stage() hands back one shared
+no-op context manager, so instrumented code pays a single flag check.
+When on, each finished stage is logged as a key=value line and kept for the
+current thread (one Streamlit session rerun) until reset() is called.
+
+tracemalloc keeps one process-wide peak. Every stage starting anywhere resets it, so
+before each reset the peak so far is folded into every open stage (on any thread);
+a stage's peak is then the highest traced memory during its run. It includes other
+threads' allocations made meanwhile, but no stage loses its peak to another's reset.
+"""
+import contextlib
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.environ.get("DASHBOARD_INSTRUMENTATION", "").lower() in ("1", "true", "yes")
+
+_NOOP = contextlib.nullcontext()
+_local = threading.local()
+# Guards tracemalloc's peak and the set of open stages, only while they are read or reset
+_peak_lock = threading.Lock()
+_open_stages = set()
+
+
+def _state():
+    if not hasattr(_local, "records"):
+        _local.records = []
+        _local.stack = []
+    return _local
+
+
+class _Stage:
+    def __init__(self, name):
+        self.name = name
+        self.peak = 0
+
+    def __enter__(self):
+        state = _state()
+        with _peak_lock:
+            current, peak = tracemalloc.get_traced_memory()
+            for stage in _open_stages:
+                stage.peak = max(stage.peak, peak)
+            tracemalloc.reset_peak()
+            self.start_memory = self.peak = current
+            _open_stages.add(self)
+        self.depth = len(state.stack)
+        state.stack.append(self)
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall = time.perf_counter() - self.start_wall
+        cpu = time.process_time() - self.start_cpu
+        with _peak_lock:
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            _open_stages.discard(self)
+
+        state = _state()
+        state.stack.pop()
+
+        record = {
+            "stage": self.name,
+            "depth": self.depth,
+            "wall_ms": wall * 1000,
+            "cpu_ms": cpu * 1000,
+            "peak_kib": max(0, peak - self.start_memory) / 1024,
+        }
+        state.records.append(record)
+        logger.info("stage=%s depth=%d wall_ms=%.1f cpu_ms=%.1f peak_kib=%.0f",
+                    self.name, self.depth, record["wall_ms"], record["cpu_ms"], record["peak_kib"])
+        return False
+
+
+def stage(name):
+    """Context manager measuring the enclosed block as stage `name`."""
+    if not ENABLED:
+        return _NOOP
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return _Stage(name)
+
+
+def records():
+    """Stages finished on this thread since the last reset(), in completion order."""
+    return list(_state().records) if ENABLED else []
+
+
+def reset():
+    if ENABLED:
+        _state().records.clear()
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+
+# Everything the Executive Summary totals split on. The sidebar filters are applied to the
+# fact rows (see DateIndex) before aggregating, as no coarser key keeps a date range exact.
+DIMENSIONS = ["PlanType", "Progress", "ClaimState"]
+MEASURES = ["Plans", "UDAs", "UDA", "UdaConfirmed"]
+
+NHS_PLAN_TYPES = ["Mixed", "NHS"]
+
+
+def _is_set(fact, column):
+    return fact[column].eq(1).fillna(False).to_numpy(dtype=bool)
+
+
+def plan_categories(fact):
+    """The cube's categorical dimensions, derived from the fact table's flags."""
+    plan_type = np.select(
+        [_is_set(fact, "isFullPrivate"), _is_set(fact, "isMixed"), _is_set(fact, "isPNHS")],
+        ["Private", "Mixed", "NHS"], default="Other")
+    # Not started is decided on the raw count, as the KPIs have always done
+    progress = np.select(
+        [fact["CompletedTreatments"].eq(0).to_numpy(), _is_set(fact, "inProgress"), _is_set(fact, "Complete")],
+        ["Not Started", "In Progress", "Complete"], default="Other")
+    claim_state = np.select(
+        [_is_set(fact, "isClaimFailed"), _is_set(fact, "isClaimQueued"), fact["ClaimStatus"].isna().to_numpy()],
+        ["Failed", "Queued", "None"], default="Other")
+    return pd.DataFrame({"PlanType": plan_type, "Progress": progress, "ClaimState": claim_state}, index=fact.index)
+
+
+def kpi_rows(fact):
+    """Dimensions and measures of every fact row, in fact table order, ready to aggregate."""
+    rows = plan_categories(fact)
+    rows["Plans"] = np.ones(len(fact), dtype=np.int64)
+    for measure in ["UDAs", "UDA", "UdaConfirmed"]:
+        # Missing amounts (e.g. no claim) add nothing, as in a groupby sum
+        rows[measure] = fact[measure].to_numpy(dtype=float, na_value=0.0)
+    # Categoricals give every row an integer cell code without hashing strings per query
+    return rows.astype({dimension: "category" for dimension in DIMENSIONS})
+
+
+def aggregate_cells(rows):
+    """Sum kpi_rows() to one cell per distinct dimension combination present."""
+    dimensions = [rows[dimension].cat for dimension in DIMENSIONS]
+    shape = tuple(max(1, len(values.categories)) for values in dimensions)
+    # Flat cell code per row; one weighted bincount per measure sums every cell
+    cell_codes = np.ravel_multi_index([values.codes.to_numpy() for values in dimensions], shape)
+    size = int(np.prod(shape))
+    plans = np.bincount(cell_codes, minlength=size)
+    present = np.flatnonzero(plans)
+
+    cells = pd.DataFrame({
+        name: np.asarray(values.categories, dtype=object)[codes]
+        for name, values, codes in zip(DIMENSIONS, dimensions, np.unravel_index(present, shape))
+    })
+    cells["Plans"] = plans[present]
+    for measure in MEASURES[1:]:
+        cells[measure] = np.bincount(cell_codes, weights=rows[measure].to_numpy(), minlength=size)[present]
+    return cells
+
+
+def build_cube(fact):
+    """Aggregate the fact table to one row per distinct dimension combination."""
+    return aggregate_cells(kpi_rows(fact))
+
+
+def _total(cells, measure, plan_types, progress=None, claim_state=None):
+    mask = cells["PlanType"].isin(plan_types)
+    if progress is not None:
+        mask &= cells["Progress"] == progress
+    if claim_state is not None:
+        mask &= cells["ClaimState"] == claim_state
+    return cells.loc[mask, measure].sum()
+
+
+def plan_summary_counts(cells):
+    """The Plans Summary `counts` dict."""
+    counts = {}
+    for row_name, plan_types in [("Private Plans", ["Private"]), ("NHS or Mixed Plans", NHS_PLAN_TYPES)]:
+        counts[row_name] = {
+            "Active Plans": round(_total(cells, "Plans", plan_types), 2),
+            "Not Yet Started": round(_total(cells, "Plans", plan_types, "Not Started"), 2),
+            "In Progress": round(_total(cells, "Plans", plan_types, "In Progress"), 2),
+            "Completed": round(_total(cells, "Plans", plan_types, "Complete"), 2),
+        }
+    return counts
+
+
+def uda_breakdown_counts(cells):
+    """The UDA Breakdown `udaCounts` dict."""
+    completed_udas = _total(cells, "UDAs", NHS_PLAN_TYPES, "Complete")
+    claimed_udas = _total(cells, "UDA", NHS_PLAN_TYPES)
+    awaiting_udas = _total(cells, "UDA", NHS_PLAN_TYPES, "Complete", "Queued")
+    successful_udas = _total(cells, "UdaConfirmed", NHS_PLAN_TYPES, "Complete")
+    failed_udas = _total(cells, "UDA", NHS_PLAN_TYPES, claim_state="Failed")
+
+    return {
+        "  UDA Breakdown  ": {
+            "Completed Plan UDAs": round(completed_udas, 2),
+            "Yet To Claim UDAs": round(abs(completed_udas - claimed_udas), 2),
+            "UDAs Claimed": round(claimed_udas, 2),
+            "UDAs Awaiting Response ": round(awaiting_udas, 2),
+            "UDAs Successful": round(successful_udas, 2),
+            "UDAs Failed": round(failed_udas, 2),
+            "UDAs Failure Rate": round((failed_udas / (failed_udas + successful_udas)) * 100, 2)
+        }
+    }
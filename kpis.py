@@ -0,0 +1,80 @@
+"""Dashboard KPIs as plain dicts and DataFrames, with no Streamlit dependency.
+
+Every function takes the fact table (see fact_table.load_fact_table) and an optional
+`filters` dict with any of account_id, start_date, end_date and provider, applied
+exactly as the sidebar filters are.
+"""
+import pandas as pd
+
+from classification import CLAIM_FAILED, CLAIM_NOT_RAISED
+from fact_table import apply_filters, load_fact_table
+from kpi_cube import build_cube, plan_summary_counts, uda_breakdown_counts
+from provider_metrics import PLAN_PROVIDERS, provider_plan_counts, provider_uda_metrics
+
+
+DEFAULT_FILTERS = {"account_id": "All", "start_date": None, "end_date": None, "provider": None}
+
+ACTIONS = [CLAIM_NOT_RAISED, CLAIM_FAILED]
+
+
+def filter_fact(df, filters=None):
+    return apply_filters(df, **{**DEFAULT_FILTERS, **(filters or {})})
+
+
+def compute_plan_summary(df, filters=None):
+    """Active/not started/in progress/completed plan counts for private and NHS or mixed plans."""
+    return plan_summary_counts(build_cube(filter_fact(df, filters)))
+
+
+def compute_uda_breakdown(df, filters=None):
+    """Completed, claimed, awaiting, successful and failed NHS UDAs and the failure rate."""
+    return uda_breakdown_counts(build_cube(filter_fact(df, filters)))
+
+
+def compute_provider_uda_metrics(df, filters=None, providers=PLAN_PROVIDERS):
+    return provider_uda_metrics(filter_fact(df, filters), providers)
+
+
+def compute_provider_plan_counts(df, filters=None, providers=PLAN_PROVIDERS):
+    return provider_plan_counts(filter_fact(df, filters), providers)
+
+
+def compute_claims_summary(df, filters=None):
+    """Plans needing a claim raised or fixed: the rows, a count/UDA table and a per-provider UDA pivot."""
+    df = filter_fact(df, filters)
+    action_counts = df["whatAction"].value_counts().to_dict()
+    claims_data = df[df["whatAction"].isin(ACTIONS)]
+    action_udas = [df.loc[df["whatAction"] == action, "UDAs"].sum() for action in ACTIONS]
+
+    plan_counts = [action_counts.get(action, 0) for action in ACTIONS]
+    summary = pd.DataFrame({
+        "Total Plans": plan_counts + [sum(plan_counts)],
+        "UDAs": action_udas + [sum(action_udas)],
+    }, index=ACTIONS + ["Total"])
+
+    pivot = pd.pivot_table(
+        claims_data, index="PlanProvider", columns="whatAction", values="UDAs", aggfunc="sum", fill_value=0,
+        observed=True,
+    )
+    # Both action columns are always present, even when no plan currently needs one of them
+    pivot = pivot.reindex(columns=sorted(ACTIONS), fill_value=0)
+    pivot.columns = [col for col in pivot.columns]
+    pivot = pivot.reset_index()
+    total_row = {"PlanProvider": "Total", **{action: pivot[action].sum() for action in ACTIONS}}
+    pivot = pd.concat([pivot, pd.DataFrame([total_row])], ignore_index=True)
+    pivot = pivot.rename(columns={"PlanProvider": "Plan Provider"})
+
+    return {"claims_data": claims_data, "summary": summary, "uda_pivot": pivot}
+
+
+def compute_dashboard(df=None, filters=None):
+    """Every Executive Summary, action and provider KPI for one set of filters."""
+    df = filter_fact(load_fact_table() if df is None else df, filters)
+    cube = build_cube(df)
+    return {
+        "plan_summary": plan_summary_counts(cube),
+        "uda_breakdown": uda_breakdown_counts(cube),
+        "provider_udas": provider_uda_metrics(df, PLAN_PROVIDERS),
+        "provider_plans": provider_plan_counts(df, PLAN_PROVIDERS),
+        "claims": compute_claims_summary(df),
+    }
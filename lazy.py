@@ -0,0 +1,38 @@
+"""Named dashboard computations, evaluated only when a visible view asks for them.
+
+Each node declares the nodes it is computed from. Resolving a node resolves its
+inputs first, and every node is computed at most once per rerun, so intermediate
+results shared by several views are built once, on demand. Nodes registered with
+a memo key are also reused across reruns through the session memo; on a hit their
+inputs are not resolved at all.
+"""
+from instrumentation import stage
+
+
+class Pipeline:
+    def __init__(self, memo=None):
+        self.memo = memo
+        self._nodes = {}
+        self._values = {}
+
+    def node(self, name, compute, deps=(), key=None):
+        """Register `compute(*values of deps)` as `name`; with `key`, results are memoized per key."""
+        self._nodes[name] = (compute, tuple(deps), key)
+
+    def __getitem__(self, name):
+        if name not in self._values:
+            compute, deps, key = self._nodes[name]
+
+            def evaluate():
+                return compute(*(self[dep] for dep in deps))
+
+            if key is not None and self.memo is not None:
+                self._values[name] = self.memo.get(name, key, evaluate)
+            else:
+                with stage(f"compute:{name}"):
+                    self._values[name] = evaluate()
+        return self._values[name]
+
+    def resolved(self):
+        """Names of the nodes computed (or fetched from the memo) during this rerun."""
+        return list(self._values)
@@ -0,0 +1,112 @@
+import datetime
+import os
+import sys
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from instrumentation import stage
+
+
+# Upper bound for the results one browser session keeps between reruns
+MAX_SESSION_CACHE_BYTES = int(os.environ.get("DASHBOARD_SESSION_CACHE_MB", "64")) * 1024 * 1024
+
+SESSION_KEY = "_memo"
+
+
+def filter_key(**state):
+    """Hashable, order-independent key for a set of filter values (dates, numpy scalars, None, ...)."""
+    normalized = []
+    for name, value in sorted(state.items()):
+        if isinstance(value, (datetime.date, pd.Timestamp)):
+            value = pd.Timestamp(value).isoformat()
+        elif isinstance(value, np.generic):
+            value = value.item()
+        normalized.append((name, value))
+    return tuple(normalized)
+
+
+def _nbytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    # Other cached objects (arrays, DatasetProfile, TrendSeries, ...) report their own size;
+    # anything else is a scalar or small structure, sized shallowly rather than serialized
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+    return sys.getsizeof(value)
+
+
+class SessionMemo:
+    """LRU cache of computed results (KPI dicts, tables, trend series) for one session.
+
+    Entries are keyed by a name plus the filter state they were computed for, and all of
+    them are dropped when `version` (the data they were computed from) changes.
+    Cached values are shared between reruns, so callers must not modify them.
+    """
+
+    def __init__(self, max_bytes=MAX_SESSION_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.version = None
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def set_version(self, version):
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+
+    def get(self, name, key, compute):
+        entry_key = (name, key)
+        entry = self._entries.get(entry_key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(entry_key)
+            return entry["value"]
+
+        self.misses += 1
+        with stage(f"compute:{name}"):
+            value = compute()
+        nbytes = _nbytes(value)
+        # Results larger than the whole budget are recomputed every time rather than evicting everything
+        if nbytes <= self.max_bytes:
+            self._entries[entry_key] = {"value": value, "bytes": nbytes}
+            self._evict()
+        return value
+
+    def _evict(self):
+        while self.total_bytes() > self.max_bytes and self._entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def total_bytes(self):
+        return sum(entry["bytes"] for entry in self._entries.values())
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes(),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def session_memo(version):
+    """This session's SessionMemo, emptied if the data has changed since its last rerun."""
+    if SESSION_KEY not in st.session_state:
+        st.session_state[SESSION_KEY] = SessionMemo()
+    memo = st.session_state[SESSION_KEY]
+    memo.set_version(version)
+    return memo
@@ -0,0 +1,70 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype
+
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+
+def row_fingerprint(dataset):
+    """Identifies which rows (by index label) a frame holds, to key cached sort orders."""
+    labels = np.ascontiguousarray(dataset.index.to_numpy())
+    digest = hashlib.sha1(labels.tobytes() if labels.dtype != object else repr(labels.tolist()).encode())
+    return len(dataset), digest.hexdigest()
+
+
+def sort_order(dataset, column, ascending=True):
+    """Row positions of `dataset` sorted by `column` (stable, missing values last)."""
+    values = dataset[column].reset_index(drop=True)
+    return values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+
+
+def page_window(dataset, page, page_size, order=None):
+    """Rows of one 1-based page, optionally in `order` (positions from sort_order), with a fresh index."""
+    start = (page - 1) * page_size
+    if order is None:
+        window = dataset.iloc[start:start + page_size]
+    else:
+        window = dataset.iloc[order[start:start + page_size]]
+    return window.reset_index(drop=True)
+
+
+def _format_value(x, two_decimals):
+    # Missing cells stay missing (shown blank) rather than becoming "nan"
+    if pd.isna(x):
+        return x
+    # Floats to 2dp when the table carries UDAs, other numbers as whole numbers
+    if isinstance(x, float) and two_decimals:
+        return f"{x:.2f}"
+    if isinstance(x, (int, float)):
+        return f"{int(x)}"
+    return x
+
+
+def format_page(page):
+    """Display strings for a page, column by column rather than cell by cell."""
+    two_decimals = "UDAs" in page.columns
+    formatted = {}
+    for column in page.columns:
+        values = page[column]
+        if is_float_dtype(values.dtype) and isinstance(values.dtype, np.dtype):
+            if two_decimals:
+                text = pd.Series(np.char.mod("%.2f", values.to_numpy()), index=values.index, dtype=object)
+                formatted[column] = text.where(values.notna(), values)
+            else:
+                whole = values.notna()
+                formatted[column] = values.astype(object).where(~whole, values.fillna(0).astype(np.int64).astype(str))
+        elif (is_integer_dtype(values.dtype) or is_bool_dtype(values.dtype)) and isinstance(values.dtype, np.dtype):
+            formatted[column] = values.astype(np.int64).astype(str).astype(object)
+        elif values.dtype.kind == "M":
+            formatted[column] = values
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            # Only the categories are formatted; missing values stay missing
+            formatted[column] = values.map(lambda x: _format_value(x, two_decimals), na_action="ignore")
+        else:
+            # Object and nullable columns, at most one page long
+            formatted[column] = values.map(lambda x: _format_value(x, two_decimals))
+    return pd.DataFrame(formatted, index=page.index)
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+
+# Clinicians shown on the per-provider breakdowns, in display order
+PLAN_PROVIDERS = ["HM", "GA", "MJ", "MM", "LL", "RM"]
+
+PROVIDER_UDA_COLUMNS = [
+    "Completed UDAs",
+    "UDAs Claimed",
+    "Yet to Claim",
+    "UDAs Successful",
+    "UDAs Awaiting Response",
+    "UDAs Failed",
+]
+
+
+def _is_set(df, column):
+    # Flags may be nullable Int8 or legacy ""/0/1 object columns
+    return df[column].eq(1).fillna(False).to_numpy(dtype=bool)
+
+
+def _values(df, column):
+    return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+
+def _by_provider(df, measures, providers):
+    # One groupby over the frame, whatever the number of providers or measures
+    totals = pd.DataFrame(measures, index=df.index).groupby(df["PlanProvider"].to_numpy(), sort=False).sum()
+    if providers is None:
+        providers = sorted(totals.index)
+    return totals.reindex(list(providers), fill_value=0)
+
+
+def provider_uda_metrics(df, providers=None):
+    """Per-provider UDA breakdown (the planProviderUDAs table), with a Total row.
+
+    `providers` defaults to every PlanProvider present in the frame.
+    """
+    nhs = _is_set(df, "isNHS")
+    completed_nhs = nhs & _is_set(df, "Complete")
+    awaiting = completed_nhs & _is_set(df, "isClaimQueued")
+    failed = nhs & _is_set(df, "isClaimFailed")
+
+    udas = _values(df, "UDAs")
+    claimed = _values(df, "UDA")
+    confirmed = _values(df, "UdaConfirmed")
+
+    table = _by_provider(df, {
+        "Completed UDAs": np.where(completed_nhs, udas, 0.0),
+        "UDAs Claimed": np.where(completed_nhs, claimed, 0.0),
+        "UDAs Successful": np.where(completed_nhs, confirmed, 0.0),
+        "UDAs Awaiting Response": np.where(awaiting, claimed, 0.0),
+        "UDAs Failed": np.where(failed, claimed, 0.0),
+    }, providers)
+
+    outstanding = table["Completed UDAs"] - table["UDAs Claimed"]
+    table["Yet to Claim"] = outstanding.abs()
+
+    total = table.sum()
+    # Over-claimed providers offset under-claimed ones in the total
+    total["Yet to Claim"] = outstanding.sum()
+    table.loc["Total"] = total
+
+    table = table[PROVIDER_UDA_COLUMNS]
+    table.index.name = "Plan Providers"
+    return table
+
+
+def provider_plan_counts(df, providers=None):
+    """Per-provider plan counts for the Provider Summary tab."""
+    private = _is_set(df, "isFullPrivate")
+    nhs = _is_set(df, "isNHS")
+    complete = _is_set(df, "Complete")
+
+    table = _by_provider(df, {
+        "Total Plans": np.ones(len(df), dtype=np.int64),
+        "Private Plans": private.astype(np.int64),
+        "NHS Plans": nhs.astype(np.int64),
+        "Private Completed": (private & complete).astype(np.int64),
+        "NHS Completed": (nhs & complete).astype(np.int64),
+    }, providers)
+    table["Total Completed"] = table["Private Completed"] + table["NHS Completed"]
+    table.index.name = "PlanProvider"
+    return table
@@ -0,0 +1,28 @@
+"""Lead provider and hygienist flag of each treatment plan.
+
+TreatmentProviders lists one provider per treatment ("HM; HM; GA"); the first is the
+plan's lead provider (PlanProvider). Both are derived once per distinct
+TreatmentProviders value and mapped back with the factorize codes, so the cost is a
+few hundred string splits whatever the number of plans.
+"""
+import numpy as np
+import pandas as pd
+
+
+HYGIENISTS = ["MH", "RP", "MK"]
+
+
+def lead_providers(provider_lists):
+    """First entry of each TreatmentProviders value (NaN stays NaN), as split(";")[0] gives it."""
+    codes, uniques = pd.factorize(provider_lists)
+    leads = np.array([value.split(";")[0] for value in uniques] + [np.nan], dtype=object)
+    # factorize codes missing values as -1, which picks the trailing NaN
+    return pd.Series(leads[codes], index=provider_lists.index, name="PlanProvider")
+
+
+def hygiene_flags(plan_providers, hygienists=HYGIENISTS):
+    """1 when the lead provider is a hygienist, 0 otherwise, <NA> for a blank or missing provider."""
+    return pd.Series(
+        pd.arrays.IntegerArray(plan_providers.isin(hygienists).to_numpy().astype(np.int8),
+                               plan_providers.fillna("").eq("").to_numpy()),
+        index=plan_providers.index, name="HygienePlans")
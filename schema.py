@@ -0,0 +1,85 @@
+"""Column projection and compact dtypes for the fact table.
+
+FACT_SCHEMA lists every column the fact table keeps and how it is stored. Join
+leftovers (Band_y), inputs that are only needed to derive other columns
+(TreatmentProviders, TotalNHSCodes) and keys nothing reads afterwards
+(ClaimReferenceNumber) are dropped. Flags stay nullable Int8, repeated strings become
+categoricals and counts/ids are downcast to the smallest integer type that holds them.
+Amounts and UDAs keep float64 so sums and 2dp formatting are unchanged.
+"""
+import pandas as pd
+
+
+# Integer columns narrowed with pd.to_numeric(downcast="integer")
+DOWNCAST = "downcast"
+
+FACT_SCHEMA = {
+    "AccountID": "category",
+    "CreatedIn": "category",
+    "CreatedDate": "datetime64[ns]",
+    "TreatmentPlanID": DOWNCAST,
+    "Band_x": "category",
+    "Payor": "category",
+    "FirstCompletedDate": "datetime64[ns]",
+    "LastCompletedDate": "datetime64[ns]",
+    "TotalTreatments": DOWNCAST,
+    "CompletedTreatments": DOWNCAST,
+    "TotalFee": "float64",
+    "CompletedTreatmentsFee": "float64",
+    "PlanProvider": "category",
+    "HygienePlans": "Int8",
+    "UDA": "float64",
+    "ClaimStatus": "category",
+    "UdaConfirmed": "float64",
+    "ClaimAttempts": DOWNCAST,
+    "FailedAttempts": DOWNCAST,
+    "isMixed": "Int8",
+    "isPNHS": "Int8",
+    "isFullPrivate": "Int8",
+    "inProgress": "Int8",
+    "Complete": "Int8",
+    "PendingFee": "float64",
+    "isNHS": "Int8",
+    "isClaimFailed": "Int8",
+    "isClaimQueued": "Int8",
+    "plansThatRequireAction": "Int8",
+    "UDAs": "float64",
+    "whatAction": "category",
+}
+
+
+def compact(frame, schema=FACT_SCHEMA):
+    """`frame` restricted to the schema's columns (in frame order), each cast to its compact dtype."""
+    compacted = frame[[column for column in frame.columns if column in schema]].copy()
+    for column in compacted.columns:
+        dtype = schema[column]
+        values = compacted[column]
+        if dtype == DOWNCAST:
+            if values.notna().all():
+                compacted[column] = pd.to_numeric(values, downcast="integer")
+        elif dtype == "Int8" and values.dtype == object:
+            # Legacy ""/0/1 flags: "" becomes <NA>
+            compacted[column] = pd.to_numeric(values.replace("", None)).astype("Int8")
+        elif values.dtype != dtype:
+            compacted[column] = values.astype(dtype)
+    return compacted
+
+
+def memory_report(frame, baseline=None):
+    """Resident bytes per column (deep), largest first, with a Total row.
+
+    With `baseline` (the same data before compaction), its bytes per column and the
+    reduction factor are shown alongside.
+    """
+    usage = frame.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({"dtype": frame.dtypes.astype(str), "bytes": usage})
+    report = report.sort_values("bytes", ascending=False)
+    if baseline is not None:
+        report["baseline_bytes"] = baseline.memory_usage(deep=True, index=False).reindex(report.index)
+    total = {"dtype": "", "bytes": usage.sum()}
+    if baseline is not None:
+        total["baseline_bytes"] = baseline.memory_usage(deep=True, index=False).sum()
+    report.loc["Total"] = total
+    if baseline is not None:
+        report["reduction"] = report["baseline_bytes"] / report["bytes"]
+    return report
@@ -0,0 +1,117 @@
+"""One read-only dataset per server process, shared by every dashboard session.
+
+A Dataset bundles the fact table with the DateIndex and KPI rows built from it,
+under one version (the sources signature), so a session never mixes structures
+from different extracts. The claim history, which the dashboard does not
+read, is only loaded on first access.
+current_dataset() hands every session the same object; sessions take their own
+filtered views from it and must not modify it.
+
+When the extracts change, the next version is built on a background thread while
+sessions keep using the current one, then swapped in with a single reference
+assignment. Only the very first load blocks.
+"""
+import logging
+import threading
+import time
+from functools import cached_property
+
+from claim_history import load_claim_history
+from date_index import DateIndex
+from fact_table import load_fact_table, sources_signature
+from kpi_cube import aggregate_cells, kpi_rows
+
+
+logger = logging.getLogger(__name__)
+
+MAX_BUILD_ATTEMPTS = 3
+
+
+class Dataset:
+    """Fact table, DateIndex and KPI rows (plus the lazily loaded claim history) for one version of the extracts."""
+
+    def __init__(self, version, fact, date_index):
+        self.version = version
+        self.fact = fact
+        self.date_index = date_index
+        self.kpi_rows = kpi_rows(fact)
+        self.loaded_at = time.time()
+
+    @cached_property
+    def claim_history(self):
+        # The fact table already holds each plan's latest claim; this is the full resubmission history
+        return load_claim_history()
+
+    def select(self, account_id="All", start_date=None, end_date=None, provider=None, date_order=False):
+        """A session's own copy of the rows matching its filters (see DateIndex.select)."""
+        return self.date_index.select(account_id, start_date, end_date, provider, date_order)
+
+    def kpi_cells(self, account_id="All", start_date=None, end_date=None, provider=None):
+        """Executive Summary cells (see kpi_cube) for the rows matching the filters."""
+        positions = self.date_index.positions(account_id, start_date, end_date, provider)
+        return aggregate_cells(self.kpi_rows.take(positions))
+
+    def info(self):
+        return {"version": self.version, "rows": len(self.fact),
+                "loaded_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.loaded_at))}
+
+
+def build_dataset():
+    """Build a Dataset whose parts all come from the same extracts.
+
+    An extract replaced mid-build could leave the fact table and the version it is
+    published under out of step, so the build is retried, up to MAX_BUILD_ATTEMPTS times; an extract that
+    keeps changing (e.g. a sync still running) gets the last build, with a warning.
+    """
+    for _ in range(MAX_BUILD_ATTEMPTS):
+        version = sources_signature()
+        fact = load_fact_table()
+        dataset = Dataset(version, fact, DateIndex(fact))
+        if sources_signature() == version:
+            return dataset
+    logger.warning("extracts changed during each of %d dataset builds; using the last one", MAX_BUILD_ATTEMPTS)
+    return dataset
+
+
+_current = None
+_refresh_lock = threading.Lock()
+_refresh_thread = None
+
+
+def _refresh():
+    global _current
+    try:
+        _current = build_dataset()
+    except Exception:
+        # Sessions keep the previous version; the next call to current_dataset() retries
+        logger.exception("dataset refresh failed")
+
+
+def refresh(wait=False):
+    """Start building the dataset for the extracts on disk, unless a build is already running."""
+    global _refresh_thread
+    with _refresh_lock:
+        if _refresh_thread is None or not _refresh_thread.is_alive():
+            _refresh_thread = threading.Thread(target=_refresh, name="dataset-refresh", daemon=True)
+            _refresh_thread.start()
+        thread = _refresh_thread
+    if wait:
+        thread.join()
+
+
+def current_dataset():
+    """The shared Dataset, starting a background refresh when the extracts have changed.
+
+    Callers should fetch it once per rerun and use that object throughout, so one
+    rerun sees a single version even if a refresh lands meanwhile.
+    """
+    global _current
+    dataset = _current
+    if dataset is None:
+        with _refresh_lock:
+            if _current is None:
+                _current = build_dataset()
+            return _current
+    if dataset.version != sources_signature():
+        refresh()
+    return dataset
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fact_table import load_fact_table  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def fact():
+    """The bundled extracts' fact table, plus a second account with shifted dates."""
+    base = load_fact_table()
+    other = base.copy()
+    other["AccountID"] = "900001"
+    for column in ["FirstCompletedDate", "LastCompletedDate"]:
+        other[column] = other[column] + pd.Timedelta(days=45)
+    frames = [frame.astype({"AccountID": str}) for frame in (base, other)]
+    combined = pd.concat(frames, ignore_index=True)
+    combined["AccountID"] = combined["AccountID"].astype("category")
+    return combined
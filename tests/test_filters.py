@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from date_index import DateIndex
+from fact_table import apply_filters
+from kpi_cube import aggregate_cells, build_cube, kpi_rows, plan_summary_counts, uda_breakdown_counts
+
+FILTERS = [
+    {},
+    {"account_id": "800088"},
+    {"account_id": "900001", "start_date": "2024-11-01"},
+    {"start_date": "2024-12-01", "end_date": "2025-02-15"},
+    {"end_date": "2024-06-30"},
+    {"account_id": "800088", "start_date": "2024-11-18", "end_date": "2025-01-31", "provider": "HM"},
+    {"start_date": "2030-01-01"},
+]
+
+
+def _filters(spec):
+    return {"account_id": "All", "start_date": None, "end_date": None, "provider": None, **spec}
+
+
+@pytest.mark.parametrize("spec", FILTERS)
+def test_date_index_selects_the_same_rows_as_apply_filters(fact, spec):
+    expected = apply_filters(fact, **_filters(spec))
+    selected = DateIndex(fact).select(**_filters(spec))
+    pd.testing.assert_frame_equal(selected.sort_index(), expected.sort_index())
+
+
+@pytest.mark.parametrize("spec", FILTERS)
+def test_indexed_cells_match_kpis_of_the_filtered_rows(fact, spec):
+    rows = apply_filters(fact, **_filters(spec))
+    positions = DateIndex(fact).positions(**_filters(spec))
+    cells = aggregate_cells(kpi_rows(fact).take(positions))
+
+    counts = plan_summary_counts(cells)
+    assert counts["Private Plans"]["Active Plans"] == rows["isFullPrivate"].eq(1).sum()
+    nhs = rows["isMixed"].eq(1) | rows["isPNHS"].eq(1)
+    assert counts["NHS or Mixed Plans"]["Active Plans"] == nhs.sum()
+    assert counts["NHS or Mixed Plans"]["Completed"] == (nhs & rows["Complete"].eq(1)).sum()
+    assert counts == plan_summary_counts(build_cube(rows))
+
+    completed = rows.loc[nhs & rows["Complete"].eq(1), "UDAs"].sum()
+    breakdown = uda_breakdown_counts(cells)["  UDA Breakdown  "]
+    assert breakdown["Completed Plan UDAs"] == pytest.approx(round(completed, 2))
+    assert breakdown["UDAs Claimed"] == pytest.approx(round(rows.loc[nhs, "UDA"].sum(), 2))
@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+
+from pagination import format_page, page_window
+
+
+def test_missing_values_stay_blank_with_two_decimals():
+    frame = pd.DataFrame({
+        "ClaimStatus": ["Failed", np.nan, None],
+        "UDAs": [3.0, np.nan, 1.2],
+        "TotalTreatments": [2, 5, 1],
+    })
+    page = format_page(page_window(frame, 1, 10))
+
+    assert page["ClaimStatus"].tolist()[0] == "Failed"
+    assert page["ClaimStatus"].iloc[1:].isna().all()
+    assert page.loc[[0, 2], "UDAs"].tolist() == ["3.00", "1.20"]
+    assert pd.isna(page.loc[1, "UDAs"])
+    assert "nan" not in page.astype(str).where(page.notna(), "").to_numpy().ravel().tolist()
+    assert page["TotalTreatments"].tolist() == ["2", "5", "1"]
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from trends import CREATED_IN_CARESTACK, TREND_METRICS, TrendSeries, default_window
+
+
+def _expected(rows, start, end, granularity):
+    """Per provider and period sums of the trend metrics, computed with a plain groupby."""
+    rows = rows[(rows["CreatedIn"] == CREATED_IN_CARESTACK)
+                & (rows["LastCompletedDate"] >= start) & (rows["LastCompletedDate"] < end + pd.Timedelta(days=1))]
+    nhs = rows["isNHS"].eq(1)
+    completed = nhs & rows["Complete"].eq(1)
+    failed = nhs & rows["isClaimFailed"].eq(1)
+    dates = rows["LastCompletedDate"]
+    if granularity == "week":
+        period = (dates - start).dt.days // 7
+    else:
+        period = dates.dt.to_period("M" if granularity == "month" else "Q").astype(str)
+    metrics = pd.DataFrame({
+        "Total UDAs": rows["UDAs"].where(completed, 0.0),
+        "Claimed UDAs": rows["UDA"].where(completed, 0.0),
+        "Successful UDAs": rows["UdaConfirmed"].where(completed, 0.0),
+        "Failed UDAs": rows["UDA"].where(failed, 0.0),
+    }).fillna(0.0)
+    return metrics.groupby([rows["PlanProvider"].astype(object), period]).sum()
+
+
+@pytest.mark.parametrize("granularity", ["week", "month", "quarter"])
+def test_series_match_groupby(fact, granularity):
+    start, end = default_window(fact)
+    trends = TrendSeries(fact, start, end)
+    expected = _expected(fact, start.normalize(), end.normalize(), granularity)
+
+    for provider in expected.index.get_level_values(0).unique():
+        series = trends.series(provider, granularity)
+        active = series[series.to_numpy().any(axis=1)]
+        want = expected.loc[provider]
+        want = want[want.to_numpy().any(axis=1)]
+        assert len(active) == len(want)
+        np.testing.assert_allclose(active[TREND_METRICS].to_numpy(), want[TREND_METRICS].to_numpy())
+        assert series[TREND_METRICS].sum().to_numpy() == pytest.approx(expected.loc[provider].sum().to_numpy())
+
+
+def test_trim_drops_only_empty_edges(fact):
+    start, end = default_window(fact)
+    trends = TrendSeries(fact, start, end)
+    provider = trends.providers()[0]
+    full = trends.series(provider, "month")
+    trimmed = trends.series(provider, "month", trim=True)
+    active = np.flatnonzero(full.to_numpy().any(axis=1))
+    assert list(trimmed.index) == list(full.index[active[0]:active[-1] + 1])
+
+
+def test_trimmed_weeks_start_at_first_active_day(fact):
+    start, end = default_window(fact)
+    trends = TrendSeries(fact, start, end)
+    for provider in trends.providers():
+        days = trends.series(provider, "day", trim=True)
+        if not days.to_numpy().any():
+            continue
+        first = pd.Timestamp(days.index[0])
+        expected = _expected(fact, first, end.normalize(), "week").loc[provider]
+        expected = expected[expected.to_numpy().any(axis=1)]
+        weeks = trends.series(provider, "week", trim=True)
+        assert weeks.index[0] == "Week 1"
+        np.testing.assert_allclose(weeks.to_numpy()[expected.index.to_numpy()], expected[TREND_METRICS].to_numpy())
+        assert weeks.to_numpy().sum() == pytest.approx(expected.to_numpy().sum())
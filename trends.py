@@ -0,0 +1,149 @@
+"""UDA trend series for every provider, by day, week, month or quarter.
+
+Rows are bucketed on integer period keys (days or weeks counted from the window start,
+calendar months or quarters counted from 1970) and every metric for every provider is
+summed in one pass per granularity into a dense provider x period x metric array.
+Looking up one provider's series is then a slice, and all metrics share the same
+periods, including periods with no activity.
+"""
+import numpy as np
+import pandas as pd
+
+
+GRANULARITIES = ["day", "week", "month", "quarter"]
+
+TREND_METRICS = ["Total UDAs", "Claimed UDAs", "Successful UDAs", "Failed UDAs"]
+
+# Only plans created in CareStack are trended, by default from the day after the switch-over
+CREATED_IN_CARESTACK = "Created in Carestack"
+DEFAULT_TREND_START = pd.Timestamp("2024-11-18")
+
+
+def _days(dates):
+    return dates.astype("datetime64[D]").astype(np.int64)
+
+
+def period_keys(dates, granularity, origin):
+    """Integer period of each datetime64 value; day and week keys count from `origin`."""
+    dates = np.asarray(dates, dtype="datetime64[ns]")
+    if granularity in ("day", "week"):
+        days = _days(dates) - _days(np.datetime64(origin, "ns"))
+        return days if granularity == "day" else days // 7
+    months = dates.astype("datetime64[M]").astype(np.int64)
+    if granularity == "month":
+        return months
+    if granularity == "quarter":
+        return months // 3
+    raise ValueError(f"unknown granularity {granularity!r}")
+
+
+def period_labels(keys, granularity, origin):
+    keys = np.asarray(keys, dtype=np.int64)
+    if granularity == "day":
+        days = np.datetime64(pd.Timestamp(origin).normalize(), "D") + keys
+        return pd.DatetimeIndex(days).strftime("%d %b %Y").tolist()
+    if granularity == "week":
+        return [f"Week {key + 1}" for key in keys]
+    if granularity == "month":
+        return pd.DatetimeIndex(keys.astype("datetime64[M]")).strftime("%B %Y").tolist()
+    return [f"Q{key % 4 + 1} {1970 + key // 4}" for key in keys]
+
+
+def default_window(frame):
+    """First and last CareStack completion on or after DEFAULT_TREND_START, or None when there are none."""
+    dates = frame.loc[frame["CreatedIn"] == CREATED_IN_CARESTACK, "LastCompletedDate"]
+    dates = dates[dates >= DEFAULT_TREND_START]
+    if dates.empty:
+        return None
+    return dates.min(), dates.max()
+
+
+def _is_set(frame, column):
+    return frame[column].eq(1).fillna(False).to_numpy(dtype=bool)
+
+
+def _values(frame, column):
+    return pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=float, na_value=0.0)
+
+
+class TrendSeries:
+    """Trend metrics for every provider over [start, end] (inclusive dates) at each granularity."""
+
+    def __init__(self, frame, start, end, granularities=GRANULARITIES):
+        self.start = pd.Timestamp(start).normalize()
+        self.end = pd.Timestamp(end).normalize()
+
+        completed = frame["LastCompletedDate"]
+        rows = frame[
+            (frame["CreatedIn"] == CREATED_IN_CARESTACK).to_numpy()
+            & (completed >= self.start).to_numpy()
+            & (completed < self.end + pd.Timedelta(days=1)).to_numpy()
+        ]
+
+        nhs = _is_set(rows, "isNHS")
+        completed_nhs = nhs & _is_set(rows, "Complete")
+        failed = nhs & _is_set(rows, "isClaimFailed")
+        measures = np.column_stack([
+            np.where(completed_nhs, _values(rows, "UDAs"), 0.0),
+            np.where(completed_nhs, _values(rows, "UDA"), 0.0),
+            np.where(completed_nhs, _values(rows, "UdaConfirmed"), 0.0),
+            np.where(failed, _values(rows, "UDA"), 0.0),
+        ])
+
+        codes, providers = pd.factorize(rows["PlanProvider"].astype(object), sort=True)
+        self._providers = {provider: code for code, provider in enumerate(providers)}
+        # Plans without a provider cannot be attributed to any series
+        attributed = codes >= 0
+        codes, measures = codes[attributed], measures[attributed]
+        dates = rows["LastCompletedDate"].to_numpy(dtype="datetime64[ns]")[attributed]
+
+        self._periods = {}
+        self._totals = {}
+        for granularity in granularities:
+            first, last = period_keys(np.array([self.start, self.end], dtype="datetime64[ns]"), granularity, self.start)
+            n_periods = int(last - first) + 1
+            # Flat (provider, period) bucket per row; one weighted bincount per metric fills the array
+            buckets = codes * n_periods + (period_keys(dates, granularity, self.start) - first)
+            size = len(providers) * n_periods
+            totals = np.stack([np.bincount(buckets, weights=measures[:, i], minlength=size)
+                               for i in range(len(TREND_METRICS))], axis=-1)
+            self._totals[granularity] = totals.reshape(len(providers), n_periods, len(TREND_METRICS))
+            self._periods[granularity] = period_labels(np.arange(first, last + 1), granularity, self.start)
+
+    @property
+    def nbytes(self):
+        return sum(totals.nbytes for totals in self._totals.values())
+
+    def providers(self):
+        return list(self._providers)
+
+    def series(self, provider, granularity, trim=False):
+        """One provider's metrics, one row per period in the window (zero where nothing was completed).
+
+        With `trim`, leading and trailing periods with no activity are dropped (unless every
+        period is empty), so the series runs from the provider's first to last active period.
+        Trimmed weeks are counted from the provider's first active day (Week 1), summed
+        from the daily totals, rather than from the window start.
+        """
+        if trim and granularity == "week" and "day" in self._totals:
+            days = self._values(provider, "day")
+            active = np.flatnonzero(days.any(axis=1))
+            if len(active):
+                days = days[active[0]:active[-1] + 1]
+                values = np.add.reduceat(days, np.arange(0, len(days), 7), axis=0)
+                periods = period_labels(np.arange(len(values)), "week", self.start)
+                return pd.DataFrame(values, index=pd.Index(periods, name="Period"), columns=TREND_METRICS)
+
+        periods = self._periods[granularity]
+        values = self._values(provider, granularity)
+        series = pd.DataFrame(values, index=pd.Index(periods, name="Period"), columns=TREND_METRICS)
+        active = np.flatnonzero(values.any(axis=1))
+        if trim and len(active):
+            series = series.iloc[active[0]:active[-1] + 1]
+        return series
+
+    def _values(self, provider, granularity):
+        code = self._providers.get(provider)
+        if code is None:
+            return np.zeros((len(self._periods[granularity]), len(TREND_METRICS)))
+        return self._totals[granularity][code]